@@ -111,7 +111,7 @@ export default function DashboardPage() {
     try {
       const response = await getAnalysisHistory(20, 0);
       setAnalyses(response.analyses);
-      setTotal(response.total);
+      setTotal(response.total ?? 0);
     } catch (err) {
       const apiError = err as ApiError;
       
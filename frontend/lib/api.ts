@@ -198,7 +198,8 @@ export interface AnalysisHistoryItem {
 
 export interface AnalysisHistoryResponse {
   analyses: AnalysisHistoryItem[];
-  total: number;
+  total: number | null;
+  has_more: boolean;
 }
 
 export async function analyzeGeneEdits(request: GeneAnalysisRequest): Promise<GeneAnalysisResponse> {
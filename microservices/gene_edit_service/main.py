@@ -3,7 +3,9 @@ FastAPI microservice for gene edit suggestions using Graph-CRISPR and DNABERT
 """
 import os
 import sys
+import asyncio
 import logging
+import threading
 import uuid
 import time
 from pathlib import Path
@@ -29,7 +31,7 @@ from services.bim_parser import BIMParser
 from services.graph_crispr_service import GraphCRISPRService
 from services.dnabert_service import DNABERTService
 from services.redis_cache import RedisCache
-from services.dataset_manager import DatasetManager
+from services.dataset_manager import DatasetInfo as DatasetRecord, DatasetManager
 import config
 
 # Configure logging
@@ -48,6 +50,10 @@ redis_cache: Optional[RedisCache] = None
 dataset_manager: Optional[DatasetManager] = None
 current_dataset_name: Optional[str] = None
 
+# _get_or_load_dataset runs in worker threads; serializes on-demand loads so a
+# dataset is parsed and cached once even when several requests ask for it
+_dataset_load_lock = threading.Lock()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -303,7 +309,8 @@ def _detect_dataset_from_request(request_text: str, dataset_name: Optional[str]
 def _get_or_load_dataset(dataset_name: Optional[str] = None, category: Optional[str] = None,
                          auto_detect_text: Optional[str] = None) -> Optional[BIMParser]:
     """
-    Get or load a dataset parser with automatic detection
+    Get or load a dataset parser with automatic detection.
+    Loading blocks on file and Redis I/O, so async callers run this via asyncio.to_thread.
     
     Args:
         dataset_name: Specific dataset name to load
@@ -348,40 +355,54 @@ def _get_or_load_dataset(dataset_name: Optional[str] = None, category: Optional[
     
     # If dataset not pre-loaded, try to load it on-demand (fallback)
     if dataset_info and dataset_info.file_path.exists():
-        try:
-            logger.warning(f"Dataset {target_dataset_name} not pre-loaded, loading on-demand...")
-            new_parser = BIMParser(
-                str(dataset_info.file_path),
-                dataset_name=target_dataset_name,
-                redis_cache=redis_cache,
-                use_cache=config.REDIS_ENABLED and redis_cache is not None
-            )
-            new_parser.load_bim_file()
-            
-            # Cache to Redis if available
-            if redis_cache and redis_cache.is_connected():
-                try:
-                    if not redis_cache.cache_index_exists(target_dataset_name):
-                        logger.info(f"Caching {target_dataset_name} to Redis...")
-                        new_parser._cache_index()
-                        logger.info(f"Cached {target_dataset_name} to Redis")
-                except Exception as e:
-                    logger.warning(f"Failed to cache {target_dataset_name} to Redis: {e}")
-            
-            # Store in dictionary for future use
-            dataset_parsers[target_dataset_name] = new_parser
-            # Update global parser and dataset name
-            bim_parser = new_parser
-            current_dataset_name = target_dataset_name
-            logger.info(f"Loaded and switched to dataset: {target_dataset_name} ({dataset_info.display_name})")
-            return new_parser
-        except Exception as e:
-            logger.error(f"Error loading dataset {target_dataset_name}: {e}")
-            return bim_parser  # Return current parser on error
+        with _dataset_load_lock:
+            return _load_dataset_on_demand(target_dataset_name, dataset_info)
     
     return bim_parser
 
 
+def _load_dataset_on_demand(target_dataset_name: str, dataset_info: DatasetRecord) -> Optional[BIMParser]:
+    """Load a dataset that was not pre-loaded and switch to it; call with _dataset_load_lock held"""
+    global bim_parser, current_dataset_name
+    
+    # Another request may have loaded it while this one waited for the lock
+    if target_dataset_name in dataset_parsers:
+        bim_parser = dataset_parsers[target_dataset_name]
+        current_dataset_name = target_dataset_name
+        return bim_parser
+    
+    try:
+        logger.warning(f"Dataset {target_dataset_name} not pre-loaded, loading on-demand...")
+        new_parser = BIMParser(
+            str(dataset_info.file_path),
+            dataset_name=target_dataset_name,
+            redis_cache=redis_cache,
+            use_cache=config.REDIS_ENABLED and redis_cache is not None
+        )
+        new_parser.load_bim_file()
+        
+        # Cache to Redis if available
+        if redis_cache and redis_cache.is_connected():
+            try:
+                if not redis_cache.cache_index_exists(target_dataset_name):
+                    logger.info(f"Caching {target_dataset_name} to Redis...")
+                    new_parser._cache_index()
+                    logger.info(f"Cached {target_dataset_name} to Redis")
+            except Exception as e:
+                logger.warning(f"Failed to cache {target_dataset_name} to Redis: {e}")
+        
+        # Store in dictionary for future use
+        dataset_parsers[target_dataset_name] = new_parser
+        # Update global parser and dataset name
+        bim_parser = new_parser
+        current_dataset_name = target_dataset_name
+        logger.info(f"Loaded and switched to dataset: {target_dataset_name} ({dataset_info.display_name})")
+        return new_parser
+    except Exception as e:
+        logger.error(f"Error loading dataset {target_dataset_name}: {e}")
+        return bim_parser  # Return current parser on error
+
+
 @app.post("/api/v1/gene-edit/suggest", response_model=GeneEditResponse)
 async def suggest_gene_edits(request: GeneEditRequest):
     """
@@ -403,7 +424,8 @@ async def suggest_gene_edits(request: GeneEditRequest):
             detection_text += f" {request.target_region}"
         
         # Get or load the appropriate dataset (with auto-detection)
-        parser = _get_or_load_dataset(
+        parser = await asyncio.to_thread(
+            _get_or_load_dataset,
             dataset_name=request.dataset_name,
             category=request.dataset_category,
             auto_detect_text=detection_text
@@ -469,7 +491,9 @@ async def suggest_gene_edits(request: GeneEditRequest):
                 chromosome = "1"  # Default - should be determined from sequence context
                 position = edit.get('target_position', 0)
                 
-                nearby_snps = parser.find_snps_near_position(
+                # Redis/DataFrame lookup runs off the event loop
+                nearby_snps = await asyncio.to_thread(
+                    parser.find_snps_near_position,
                     chromosome=chromosome,
                     position=position,
                     window=1000
@@ -612,7 +636,7 @@ async def get_cache_stats():
     if not redis_cache:
         return {"connected": False, "message": "Redis cache not available"}
     
-    return redis_cache.get_cache_stats()
+    return await asyncio.to_thread(redis_cache.get_cache_stats)
 
 
 @app.post("/api/v1/cache/reload")
@@ -656,7 +680,7 @@ async def reload_cache():
             parser.use_cache = True
             
             # Check if already cached
-            if redis_cache.cache_index_exists(dataset_name):
+            if await asyncio.to_thread(redis_cache.cache_index_exists, dataset_name):
                 results.append({
                     "dataset": dataset_name,
                     "status": "already_cached",
@@ -666,7 +690,7 @@ async def reload_cache():
             else:
                 # Cache the dataset
                 logger.info(f"Caching {dataset_info.display_name} to Redis...")
-                parser._cache_index()
+                await asyncio.to_thread(parser._cache_index)
                 results.append({
                     "dataset": dataset_name,
                     "status": "cached",
@@ -695,12 +719,12 @@ async def reload_cache():
 @app.get("/api/v1/snps/{chromosome}/{position}")
 async def get_snp_info(chromosome: str, position: int, window: int = 1000, dataset: Optional[str] = None):
     """Get SNP information for a specific genomic position"""
-    parser = _get_or_load_dataset(dataset_name=dataset) if dataset else bim_parser
+    parser = await asyncio.to_thread(_get_or_load_dataset, dataset_name=dataset) if dataset else bim_parser
     if not parser:
         raise HTTPException(status_code=503, detail="BIM parser not available")
     
     try:
-        snps = parser.find_snps_near_position(chromosome, position, window)
+        snps = await asyncio.to_thread(parser.find_snps_near_position, chromosome, position, window)
         return {
             "chromosome": chromosome,
             "position": position,
@@ -716,7 +740,7 @@ async def get_snp_info(chromosome: str, position: int, window: int = 1000, datas
 @app.get("/api/v1/snps/by-id/{snp_id}")
 async def get_snp_by_id(snp_id: str, dataset: Optional[str] = None):
     """Get SNP information by SNP ID"""
-    parser = _get_or_load_dataset(dataset_name=dataset) if dataset else bim_parser
+    parser = await asyncio.to_thread(_get_or_load_dataset, dataset_name=dataset) if dataset else bim_parser
     if not parser:
         raise HTTPException(status_code=503, detail="BIM parser not available")
     
@@ -13,6 +13,14 @@ logger = logging.getLogger(__name__)
 class BIMParser:
     """Parser for BIM (PLINK binary format) files containing SNP data"""
     
+    # Regions spanning fewer positions than this are served from the cached
+    # index with a single bulk lookup instead of a DataFrame scan
+    BULK_REGION_MAX_POSITIONS = 4096
+    
+    # Windows with no SNPs are cached too, for less time than the default hour,
+    # so sparse regions skip the bulk lookup and DataFrame scan on repeat calls
+    EMPTY_REGION_CACHE_TTL = 600
+    
     def __init__(self, bim_file_path: str, dataset_name: Optional[str] = None, 
                  redis_cache: Optional[Any] = None, use_cache: bool = True):
         """
@@ -211,6 +219,14 @@ class BIMParser:
             cached = self.redis_cache.get_cached_region(self.dataset_name, str(chromosome), start, end)
             if cached is not None:
                 return cached
+            
+            # Short windows: look up every position in the cached index at once
+            if end - start < self.BULK_REGION_MAX_POSITIONS:
+                positions = [(str(chromosome), pos) for pos in range(max(start, 0), end + 1)]
+                snps = [snp for snp in self.redis_cache.get_cached_snps_bulk(self.dataset_name, positions) if snp]
+                if snps:
+                    self.redis_cache.cache_region(self.dataset_name, str(chromosome), start, end, snps)
+                    return snps
         
         # Fall back to DataFrame query
         if self.snp_data is None:
@@ -224,9 +240,14 @@ class BIMParser:
         
         snps = self.snp_data[mask].to_dict('records')
         
-        # Cache the result
-        if self.use_cache and snps:
-            self.redis_cache.cache_region(self.dataset_name, str(chromosome), start, end, snps)
+        # Cache the result, empty or not
+        if self.use_cache:
+            if snps:
+                self.redis_cache.cache_region(self.dataset_name, str(chromosome), start, end, snps)
+            else:
+                self.redis_cache.cache_region(
+                    self.dataset_name, str(chromosome), start, end, snps, ttl=self.EMPTY_REGION_CACHE_TTL
+                )
         
         return snps
     
@@ -4,19 +4,83 @@ DNABERT service wrapper for validating gene edits
 import os
 import sys
 import logging
+import threading
+import types
 import numpy as np
 import pandas as pd
 import torch
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 import tempfile
 
-# Add DNABERT to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "DNABERT"))
-
 logger = logging.getLogger(__name__)
 
 
+def _ensure_on_path(path: Path):
+    """Add a directory to sys.path once"""
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+
+# Import DNABERT modules once; load_model falls back to mock validation without them
+_ensure_on_path(Path(__file__).parent.parent.parent / "DNABERT")
+try:
+    from src.transformers import BertForSequenceClassification, BertTokenizer, BertTokenizerFast
+except ImportError as e:
+    logger.warning(f"DNABERT modules unavailable: {e}")
+    BertForSequenceClassification = BertTokenizer = BertTokenizerFast = None
+
+# Loaded (model, tokenizer) pairs shared across service instances,
+# keyed by (model_path, kmer, device)
+_MODEL_CACHE: Dict[Tuple[str, int, str], Tuple[Any, Any]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _sdpa_self_attention_forward(
+    self,
+    hidden_states,
+    attention_mask=None,
+    head_mask=None,
+    encoder_hidden_states=None,
+    encoder_attention_mask=None,
+):
+    """
+    BertSelfAttention.forward using torch's fused scaled_dot_product_attention
+    
+    Avoids materializing the full attention probability matrix. Falls back to
+    the original implementation when attention weights or head masking are
+    requested, since the fused kernel does not expose them.
+    """
+    if self.output_attentions or head_mask is not None:
+        return self._eager_forward(
+            hidden_states, attention_mask, head_mask, encoder_hidden_states, encoder_attention_mask
+        )
+    
+    if encoder_hidden_states is not None:
+        key_states = encoder_hidden_states
+        attention_mask = encoder_attention_mask
+    else:
+        key_states = hidden_states
+    
+    query_layer = self.transpose_for_scores(self.query(hidden_states))
+    key_layer = self.transpose_for_scores(self.key(key_states))
+    value_layer = self.transpose_for_scores(self.value(key_states))
+    
+    # attention_mask is the additive (batch, 1, 1, seq) mask built by BertModel
+    context_layer = torch.nn.functional.scaled_dot_product_attention(
+        query_layer,
+        key_layer,
+        value_layer,
+        attn_mask=attention_mask,
+        dropout_p=self.dropout.p if self.training else 0.0,
+    )
+    
+    context_layer = context_layer.permute(0, 2, 1, 3).contiguous()
+    new_context_layer_shape = context_layer.size()[:-2] + (self.all_head_size,)
+    return (context_layer.view(*new_context_layer_shape),)
+
+
 class DNABERTService:
     """Service wrapper for DNABERT model validation"""
     
@@ -24,7 +88,8 @@ class DNABERTService:
         self,
         model_path: Optional[str] = None,
         kmer: int = 6,
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        max_batch: int = 32
     ):
         """
         Initialize DNABERT service
@@ -33,13 +98,22 @@ class DNABERTService:
             model_path: Path to DNABERT model directory
             kmer: K-mer size (default: 6)
             device: Device to run model on ('cuda' or 'cpu')
+            max_batch: Maximum sequences per forward pass (default: 32)
         """
         self.device = device
         self.model_path = model_path
         self.kmer = kmer
+        self.max_batch = max_batch
         self.model = None
         self.tokenizer = None
         self.is_loaded = False
+        self._rng = np.random.default_rng()
+        
+        # Fixed-shape model inputs reused across calls, allocated on load; one
+        # instance is shared by request threads, so the lock serializes their use
+        self._input_ids_buffer: Optional[torch.Tensor] = None
+        self._attention_mask_buffer: Optional[torch.Tensor] = None
+        self._buffer_lock = threading.Lock()
         
         # Default paths relative to DNABERT directory
         self.dnabert_dir = Path(__file__).parent.parent.parent / "DNABERT"
@@ -59,32 +133,96 @@ class DNABERTService:
             self.is_loaded = False
             return
         
-        try:
-            # Import DNABERT modules
-            from src.transformers import BertForSequenceClassification, BertTokenizer
-            
-            # Load tokenizer
-            tokenizer_name = f"dna{self.kmer}"
-            tokenizer_path = self.dnabert_dir / "src" / "transformers" / tokenizer_name
+        cache_key = (str(Path(self.model_path).resolve()), self.kmer, str(self.device))
+        with _MODEL_CACHE_LOCK:
+            cached = _MODEL_CACHE.get(cache_key)
+            if cached is not None:
+                self.model, self.tokenizer = cached
+                self._allocate_input_buffers()
+                self.is_loaded = True
+                logger.info(f"Reusing loaded DNABERT model from {self.model_path}")
+                return
             
-            if tokenizer_path.exists():
-                self.tokenizer = BertTokenizer.from_pretrained(str(tokenizer_path))
-            else:
-                logger.warning(f"Tokenizer not found at {tokenizer_path}. Using mock validation.")
+            if BertForSequenceClassification is None:
+                logger.warning("DNABERT modules not importable. Service will use mock validation.")
                 self.is_loaded = False
                 return
             
-            # Load model
-            self.model = BertForSequenceClassification.from_pretrained(self.model_path)
-            self.model.to(self.device)
-            self.model.eval()
-            self.is_loaded = True
-            logger.info(f"Loaded DNABERT model from {self.model_path}")
-            
+            try:
+                # Load tokenizer
+                tokenizer_name = f"dna{self.kmer}"
+                tokenizer_path = self.dnabert_dir / "src" / "transformers" / tokenizer_name
+                
+                if tokenizer_path.exists():
+                    self.tokenizer = self._load_tokenizer(tokenizer_path)
+                else:
+                    logger.warning(f"Tokenizer not found at {tokenizer_path}. Using mock validation.")
+                    self.is_loaded = False
+                    return
+                
+                # Load model
+                self.model = BertForSequenceClassification.from_pretrained(self.model_path)
+                self.model.to(self.device)
+                self.model.eval()
+                self._enable_sdpa_attention()
+                self._allocate_input_buffers()
+                self.is_loaded = True
+                _MODEL_CACHE[cache_key] = (self.model, self.tokenizer)
+                logger.info(f"Loaded DNABERT model from {self.model_path}")
+                
+            except Exception as e:
+                logger.error(f"Error loading DNABERT model: {e}")
+                logger.warning("Falling back to mock validation")
+                self.is_loaded = False
+    
+    def _allocate_input_buffers(self):
+        """Allocate the fixed-shape input ID and attention mask buffers on the device"""
+        self._input_ids_buffer = torch.zeros((self.max_batch, 512), dtype=torch.long, device=self.device)
+        self._attention_mask_buffer = torch.zeros_like(self._input_ids_buffer)
+    
+    def _enable_sdpa_attention(self):
+        """Route BERT self-attention through scaled_dot_product_attention when available"""
+        if not hasattr(torch.nn.functional, 'scaled_dot_product_attention'):
+            return
+        
+        patched = 0
+        for module in self.model.modules():
+            if type(module).__name__ == 'BertSelfAttention' and not hasattr(module, '_eager_forward'):
+                module._eager_forward = module.forward
+                module.forward = types.MethodType(_sdpa_self_attention_forward, module)
+                patched += 1
+        
+        if patched:
+            logger.info(f"Using scaled_dot_product_attention for {patched} DNABERT attention layers")
+    
+    def _load_tokenizer(self, tokenizer_path: Path):
+        """
+        Load the k-mer tokenizer, preferring the Rust-backed fast tokenizer
+        
+        K-mer input is already whitespace-split and uppercase, so lowercasing
+        is disabled. Falls back to the slow tokenizer if the fast one cannot
+        be built or its vocabulary does not match.
+        
+        Args:
+            tokenizer_path: Path to tokenizer directory
+        
+        Returns:
+            Tokenizer instance
+        """
+        slow = BertTokenizer.from_pretrained(str(tokenizer_path), do_lower_case=False)
+        try:
+            fast = BertTokenizerFast.from_pretrained(str(tokenizer_path), do_lower_case=False)
         except Exception as e:
-            logger.error(f"Error loading DNABERT model: {e}")
-            logger.warning("Falling back to mock validation")
-            self.is_loaded = False
+            logger.warning(f"Fast tokenizer unavailable ({e}). Using slow tokenizer.")
+            return slow
+        
+        special_tokens = slow.all_special_tokens
+        if (fast.vocab_size != slow.vocab_size or
+                fast.convert_tokens_to_ids(special_tokens) != slow.convert_tokens_to_ids(special_tokens)):
+            logger.warning("Fast tokenizer vocabulary mismatch. Using slow tokenizer.")
+            return slow
+        
+        return fast
     
     def seq2kmer(self, seq: str, k: int) -> str:
         """
@@ -127,53 +265,190 @@ class DNABERTService:
         Returns:
             Prediction score (0-1)
         """
+        return float(self.predict_sequence_scores([sequence])[0])
+    
+    def predict_sequence_scores(self, sequences: List[str]) -> np.ndarray:
+        """
+        Predict scores for a batch of DNA sequences in a single forward pass
+        
+        Args:
+            sequences: List of DNA sequences
+            
+        Returns:
+            Array of prediction scores (0-1), one per sequence
+        """
+        if not sequences:
+            return np.empty(0, dtype=np.float64)
+        
         if not self.is_loaded:
-            return self._mock_prediction(sequence)
+            return self._mock_prediction_batch(sequences)
         
         try:
-            # Convert to k-mer
-            kmer_seq = self.seq2kmer(sequence, self.kmer)
+            # Convert to k-mer and tokenize
+            kmer_seqs = [self.seq2kmer(seq, self.kmer) for seq in sequences]
+            input_ids, attention_mask = self._encode_batch(kmer_seqs)
+            return self._score_encoded(input_ids, attention_mask)
             
-            # Tokenize
-            encoded = self.tokenizer.encode_plus(
-                kmer_seq,
-                add_special_tokens=True,
-                max_length=512,
-                padding='max_length',
-                truncation=True,
-                return_attention_mask=True,
-                return_tensors='pt'
-            )
+        except Exception as e:
+            logger.error(f"Error in DNABERT prediction: {e}")
+            return self._mock_prediction_batch(sequences)
+    
+    def _score_encoded(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> np.ndarray:
+        """
+        Run the model on already tokenized inputs
+        
+        Args:
+            input_ids: Token ID tensor of shape (batch, seq_len)
+            attention_mask: Attention mask tensor of shape (batch, seq_len)
             
-            # Move to device
-            input_ids = encoded['input_ids'].to(self.device)
-            attention_mask = encoded['attention_mask'].to(self.device)
+        Returns:
+            Array of prediction scores (0-1), one per row
+        """
+        buffer = self._input_ids_buffer
+        if buffer is None or input_ids.shape[1] != buffer.shape[1]:
+            probs = self._forward_scores(input_ids.to(self.device), attention_mask.to(self.device))
+            return probs.double().cpu().numpy()
+        
+        # Copy each chunk into the persistent buffers instead of allocating new
+        # device tensors per call. The scores are moved to the host before the
+        # lock is released, since the next caller overwrites the buffers.
+        with self._buffer_lock:
+            scores = []
+            for start in range(0, input_ids.shape[0], self.max_batch):
+                chunk_ids = input_ids[start:start + self.max_batch]
+                rows = chunk_ids.shape[0]
+                self._input_ids_buffer[:rows].copy_(chunk_ids)
+                self._attention_mask_buffer[:rows].copy_(attention_mask[start:start + rows])
+                scores.append(self._forward_scores(self._input_ids_buffer[:rows], self._attention_mask_buffer[:rows]))
             
-            # Predict
-            with torch.no_grad():
-                outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-                logits = outputs.logits
-                # Apply sigmoid for binary classification or softmax for multi-class
-                if logits.shape[1] == 1:
-                    score = torch.sigmoid(logits).item()
+            # Single device-to-host transfer for the whole batch
+            return torch.cat(scores).double().cpu().numpy()
+    
+    def _forward_scores(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Run a forward pass and return scores as a tensor on the model device"""
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
+            logits = outputs[0]
+            # Apply sigmoid for binary classification or softmax for multi-class
+            if logits.shape[1] == 1:
+                probs = torch.sigmoid(logits[:, 0])
+            else:
+                probs = torch.softmax(logits, dim=1)[:, 1]
+        
+        return probs
+    
+    def _predict_edit_scores(
+        self,
+        original_sequence: str,
+        edit_suggestions: List[Dict],
+        mutated_sequences: List[str]
+    ) -> np.ndarray:
+        """
+        Score the original sequence followed by each mutated sequence
+        
+        The original is tokenized once. Substitutions reuse its token IDs and
+        only re-map the k-mers overlapping the edited base; other edit types
+        shift every downstream k-mer and are tokenized in full.
+        
+        Args:
+            original_sequence: Original DNA sequence
+            edit_suggestions: Edit dictionaries matching mutated_sequences
+            mutated_sequences: Sequences with each edit applied
+            
+        Returns:
+            Array of scores: original first, then one per mutated sequence
+        """
+        if not self.is_loaded:
+            return self.predict_sequence_scores([original_sequence] + mutated_sequences)
+        
+        try:
+            k = self.kmer
+            orig_ids, orig_mask = self._encode_batch([self.seq2kmer(original_sequence, k)])
+            orig_ids, orig_mask = orig_ids[0], orig_mask[0]
+            
+            # Token i+1 holds k-mer i ([CLS] comes first); the tail is truncated
+            last_kmer = min(len(original_sequence) - k, orig_ids.shape[0] - 3)
+            
+            rows_ids = [orig_ids]
+            rows_mask = [orig_mask]
+            full_encode = []
+            for edit, mutated in zip(edit_suggestions, mutated_sequences):
+                if mutated == original_sequence:
+                    rows_ids.append(orig_ids)
+                elif edit.get('edit_type', 'substitution') == 'substitution' and len(mutated) == len(original_sequence):
+                    pos = edit.get('target_position', 0)
+                    first = max(0, pos - k + 1)
+                    last = min(pos, last_kmer)
+                    ids = orig_ids.clone()
+                    if first <= last:
+                        new_kmers = [mutated[i:i + k] for i in range(first, last + 1)]
+                        ids[first + 1:last + 2] = torch.tensor(
+                            self.tokenizer.convert_tokens_to_ids(new_kmers), dtype=ids.dtype
+                        )
+                    rows_ids.append(ids)
                 else:
-                    score = torch.softmax(logits, dim=1)[0][1].item()
+                    full_encode.append(len(rows_ids))
+                    rows_ids.append(None)
+                rows_mask.append(orig_mask)
             
-            return float(score)
+            if full_encode:
+                ids, mask = self._encode_batch([self.seq2kmer(mutated_sequences[i - 1], k) for i in full_encode])
+                for row, i in enumerate(full_encode):
+                    rows_ids[i] = ids[row]
+                    rows_mask[i] = mask[row]
+            
+            return self._score_encoded(torch.stack(rows_ids), torch.stack(rows_mask))
             
         except Exception as e:
             logger.error(f"Error in DNABERT prediction: {e}")
-            return self._mock_prediction(sequence)
+            return self._mock_prediction_batch([original_sequence] + mutated_sequences)
+    
+    def _encode_batch(self, kmer_seqs: List[str]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Tokenize k-mer strings into padded input ID and attention mask tensors
+        
+        Args:
+            kmer_seqs: List of space-separated k-mer strings
+            
+        Returns:
+            Tuple of (input_ids, attention_mask) tensors of shape (batch, 512)
+        """
+        if hasattr(self.tokenizer, '_tokenizer'):
+            # Fast tokenizer encodes the whole batch in one call
+            encoded = self.tokenizer.batch_encode_plus(
+                kmer_seqs,
+                add_special_tokens=True,
+                max_length=512,
+                pad_to_max_length=True,
+                return_attention_mask=True,
+                return_tensors='pt'
+            )
+            return encoded['input_ids'], encoded['attention_mask']
+        
+        encoded = [
+            self.tokenizer.encode_plus(
+                kmer_seq,
+                add_special_tokens=True,
+                max_length=512,
+                pad_to_max_length=True,
+                return_attention_mask=True
+            )
+            for kmer_seq in kmer_seqs
+        ]
+        input_ids = torch.tensor([e['input_ids'] for e in encoded], dtype=torch.long)
+        attention_mask = torch.tensor([e['attention_mask'] for e in encoded], dtype=torch.long)
+        return input_ids, attention_mask
     
-    def _mock_prediction(self, sequence: str) -> float:
-        """Generate mock prediction when model is not available"""
-        # Simple heuristic: score based on GC content and length
-        gc_content = (sequence.count('G') + sequence.count('C')) / len(sequence) if sequence else 0.5
-        length_factor = min(1.0, len(sequence) / 1000)
+    def _mock_prediction_batch(self, sequences: List[str]) -> np.ndarray:
+        """Generate mock predictions for a batch, drawing all noise in one call"""
+        lengths = np.array([len(seq) for seq in sequences], dtype=np.float64)
+        gc_counts = np.array([seq.count('G') + seq.count('C') for seq in sequences], dtype=np.float64)
+        gc_content = np.divide(gc_counts, lengths, out=np.full_like(lengths, 0.5), where=lengths > 0)
+        length_factor = np.minimum(1.0, lengths / 1000)
         
         # Mock score between 0.3 and 0.8
-        score = 0.3 + (gc_content * 0.3) + (length_factor * 0.2) + np.random.normal(0, 0.05)
-        return float(max(0.0, min(1.0, score)))
+        scores = 0.3 + (gc_content * 0.3) + (length_factor * 0.2) + self._rng.normal(0, 0.05, size=len(sequences))
+        return np.clip(scores, 0.0, 1.0)
     
     def validate_mutation(
         self,
@@ -195,30 +470,67 @@ class DNABERTService:
             Dictionary with validation results
         """
         # Get predictions
-        original_score = self.predict_sequence_score(original_sequence)
-        mutated_score = self.predict_sequence_score(mutated_sequence)
+        original_score, mutated_score = self.predict_sequence_scores([original_sequence, mutated_sequence])
+        
+        return self._compare_scores(
+            np.array([original_score]),
+            np.array([mutated_score]),
+            [mutation_position],
+            threshold
+        )[0]
+    
+    def _compare_scores(
+        self,
+        original_scores: np.ndarray,
+        mutated_scores: np.ndarray,
+        mutation_positions: List[int],
+        threshold: float
+    ) -> List[Dict]:
+        """
+        Compute validation metrics for all mutations in a single vectorized pass
+        
+        Args:
+            original_scores: Scores of the original sequences (broadcastable)
+            mutated_scores: Scores of the mutated sequences
+            mutation_positions: Position of each mutation
+            threshold: Minimum difference threshold for validation
+            
+        Returns:
+            List of validation result dictionaries
+        """
+        original_scores = np.broadcast_to(np.asarray(original_scores, dtype=np.float64), mutated_scores.shape)
         
         # Calculate metrics
-        difference = mutated_score - original_score
-        abs_difference = abs(difference)
+        difference = mutated_scores - original_scores
         
-        # Log odds ratio (avoid division by zero)
-        if original_score > 0 and original_score < 1 and mutated_score > 0 and mutated_score < 1:
-            log_or = np.log2(original_score / (1 - original_score)) - np.log2(mutated_score / (1 - mutated_score))
-        else:
-            log_or = 0.0
+        # Log odds ratio, only where both scores are strictly inside (0, 1)
+        valid = (original_scores > 0) & (original_scores < 1) & (mutated_scores > 0) & (mutated_scores < 1)
+        log_or = np.zeros_like(difference)
+        o = original_scores[valid]
+        m = mutated_scores[valid]
+        log_or[valid] = np.log2(o / (1 - o)) - np.log2(m / (1 - m))
         
         # Validation passed if difference exceeds threshold
-        validation_passed = abs_difference >= threshold
-        
-        return {
-            'original_score': original_score,
-            'mutated_score': mutated_score,
-            'difference': difference,
-            'log_odds_ratio': log_or,
-            'validation_passed': validation_passed,
-            'mutation_position': mutation_position
-        }
+        validation_passed = np.abs(difference) >= threshold
+        
+        return [
+            {
+                'original_score': orig,
+                'mutated_score': mut,
+                'difference': diff,
+                'log_odds_ratio': lor,
+                'validation_passed': passed,
+                'mutation_position': position
+            }
+            for orig, mut, diff, lor, passed, position in zip(
+                original_scores.tolist(),
+                mutated_scores.tolist(),
+                difference.tolist(),
+                log_or.tolist(),
+                validation_passed.tolist(),
+                mutation_positions
+            )
+        ]
     
     def validate_edits(
         self,
@@ -237,23 +549,21 @@ class DNABERTService:
         Returns:
             List of validation results
         """
-        validations = []
+        if not edit_suggestions:
+            return []
         
-        for edit in edit_suggestions:
-            # Create mutated sequence
-            mutated_sequence = self._apply_edit(original_sequence, edit)
-            
-            # Validate
-            validation = self.validate_mutation(
-                original_sequence,
-                mutated_sequence,
-                edit.get('target_position', 0),
-                threshold
-            )
-            
-            validations.append(validation)
+        # Create mutated sequences
+        mutated_sequences = [self._apply_edit(original_sequence, edit) for edit in edit_suggestions]
         
-        return validations
+        # Score the original once alongside all mutations in a single batch
+        scores = self._predict_edit_scores(original_sequence, edit_suggestions, mutated_sequences)
+        
+        return self._compare_scores(
+            scores[0],
+            scores[1:],
+            [edit.get('target_position', 0) for edit in edit_suggestions],
+            threshold
+        )
     
     def _apply_edit(self, sequence: str, edit: Dict) -> str:
         """
@@ -274,15 +584,32 @@ class DNABERTService:
         if pos < 0 or pos >= len(sequence):
             return sequence
         
-        if edit_type == 'substitution':
-            if sequence[pos] == original_base:
+        if not (sequence.isascii() and target_base.isascii()):
+            # Byte buffer positions only line up with str indices for ASCII
+            if edit_type == 'substitution' and sequence[pos] == original_base:
                 return sequence[:pos] + target_base + sequence[pos+1:]
+            elif edit_type == 'insertion':
+                return sequence[:pos] + target_base + sequence[pos:]
+            elif edit_type == 'deletion':
+                return sequence[:pos] + sequence[pos+1:]
+            return sequence
+        
+        # Mutate a single byte buffer instead of concatenating slices
+        if edit_type == 'substitution':
+            if sequence[pos] != original_base:
+                return sequence
+            buf = bytearray(sequence, 'ascii')
+            buf[pos:pos+1] = target_base.encode('ascii')
         elif edit_type == 'insertion':
-            return sequence[:pos] + target_base + sequence[pos:]
+            buf = bytearray(sequence, 'ascii')
+            buf[pos:pos] = target_base.encode('ascii')
         elif edit_type == 'deletion':
-            return sequence[:pos] + sequence[pos+1:]
+            buf = bytearray(sequence, 'ascii')
+            del buf[pos]
+        else:
+            return sequence
         
-        return sequence
+        return buf.decode('ascii')
     
     def batch_validate(
         self,
@@ -299,16 +626,20 @@ class DNABERTService:
         Returns:
             List of validation results
         """
-        results = []
-        
-        for seq, mut in zip(sequences, mutations):
-            mutated_seq = self._apply_edit(seq, mut)
-            validation = self.validate_mutation(
-                seq,
-                mutated_seq,
-                mut.get('target_position', 0)
-            )
-            results.append(validation)
+        pairs = list(zip(sequences, mutations))
+        if not pairs:
+            return []
+        
+        # Score all originals and mutations in a single batch
+        originals = [seq for seq, _ in pairs]
+        mutated = [self._apply_edit(seq, mut) for seq, mut in pairs]
+        scores = self.predict_sequence_scores(originals + mutated)
+        n = len(pairs)
         
-        return results
+        return self._compare_scores(
+            scores[:n],
+            scores[n:],
+            [mut.get('target_position', 0) for _, mut in pairs],
+            0.1
+        )
 
@@ -3,13 +3,75 @@ Redis cache service for SNP index caching
 """
 import json
 import logging
+import time
 import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Optional, Tuple, Any
 import redis
 from redis.exceptions import ConnectionError, TimeoutError
+from redis.utils import HIREDIS_AVAILABLE
+
+try:
+    import msgspec
+    
+    class SNPRecord(msgspec.Struct, array_like=True):
+        """Cached SNP index entry, encoded as a positional array without field names"""
+        snp_id: str
+        ref_allele: str
+        alt_allele: str
+        genetic_distance: float
+        chromosome: str
+        position: int
+    
+    _enc = msgspec.msgpack.Encoder()
+    _snp_dec = msgspec.msgpack.Decoder(SNPRecord)
+    _region_dec = msgspec.msgpack.Decoder(List[SNPRecord])
+    
+    def _to_record(snp: Dict) -> SNPRecord:
+        # Region rows come straight from the DataFrame, so normalize types
+        # to match what the typed decoders expect
+        return SNPRecord(
+            str(snp['snp_id']),
+            str(snp['ref_allele']),
+            str(snp['alt_allele']),
+            float(snp['genetic_distance']),
+            str(snp['chromosome']),
+            int(snp['position'])
+        )
+    
+    def _encode_snp(snp_info: Dict) -> bytes:
+        return _enc.encode(_to_record(snp_info))
+    
+    def _decode_snp(data: bytes) -> Dict:
+        return msgspec.structs.asdict(_snp_dec.decode(data))
+    
+    def _encode_region(snps: List[Dict]) -> bytes:
+        return _enc.encode([_to_record(snp) for snp in snps])
+    
+    def _decode_region(data: bytes) -> List[Dict]:
+        return [msgspec.structs.asdict(record) for record in _region_dec.decode(data)]
+    
+    # msgpack values live under a versioned namespace so entries in an older
+    # layout (JSON, keyed dicts, untyped region lists) are never mis-decoded
+    _VALUE_NS = "v4:"
+except ImportError:
+    msgspec = None
+    _encode_snp = _encode_region = lambda obj: json.dumps(obj).encode()
+    _decode_snp = _decode_region = json.loads
+    _VALUE_NS = ""
 
 logger = logging.getLogger(__name__)
 
+# Bulk index loads: SNP entries per HSET command, and entries queued before a
+# pipeline flush. At roughly 50 bytes per encoded entry this keeps each
+# pipeline's request buffer near 1MB.
+HSET_BATCH_SIZE = 2000
+PIPELINE_FLUSH_EVERY = 20000
+
 
 class RedisCache:
     """Redis cache service for SNP indices and queries"""
@@ -25,7 +87,7 @@ class RedisCache:
             port: Redis port
             db: Redis database number
             password: Redis password (if required)
-            decode_responses: Whether to decode responses as strings
+            decode_responses: Whether to decode metadata responses as strings
             socket_timeout: Socket timeout in seconds
             socket_connect_timeout: Connection timeout in seconds
         """
@@ -34,6 +96,11 @@ class RedisCache:
         self.db = db
         self.password = password
         self.decode_responses = decode_responses
+        self._last_ping = time.monotonic()
+        
+        # In-process LRU in front of Redis for hot SNP lookups
+        self._local_snps: "OrderedDict[Tuple[str, str, int], Dict]" = OrderedDict()
+        self._local_lock = threading.Lock()
         
         try:
             self.client = redis.Redis(
@@ -41,43 +108,102 @@ class RedisCache:
                 port=port,
                 db=db,
                 password=password,
-                decode_responses=decode_responses,
+                # SNP values are msgpack-encoded bytes; strings are decoded where needed
+                decode_responses=False,
                 socket_timeout=socket_timeout,
                 socket_connect_timeout=socket_connect_timeout,
-                health_check_interval=30
+                health_check_interval=30,
+                client_name="gene_edit"
             )
             # Test connection
             self.client.ping()
             self.connected = True
-            logger.info(f"Connected to Redis at {host}:{port}")
+            logger.info(f"Connected to Redis at {host}:{port} (parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})")
+            if not HIREDIS_AVAILABLE:
+                logger.warning("hiredis not installed; falling back to the slower pure-Python RESP parser")
         except (ConnectionError, TimeoutError) as e:
             logger.warning(f"Redis connection failed: {e}. Cache will be disabled.")
             self.client = None
             self.connected = False
     
+    # Maximum SNP entries kept in the in-process LRU
+    LOCAL_CACHE_SIZE = 100_000
+    
+    def _local_get(self, key: Tuple[str, str, int]) -> Optional[Dict]:
+        """Look up a SNP in the in-process LRU"""
+        with self._local_lock:
+            snp = self._local_snps.get(key)
+            if snp is not None:
+                self._local_snps.move_to_end(key)
+            return snp
+    
+    def _local_put(self, key: Tuple[str, str, int], snp: Dict):
+        """Store a SNP in the in-process LRU, evicting the least recently used"""
+        with self._local_lock:
+            self._local_snps[key] = snp
+            self._local_snps.move_to_end(key)
+            if len(self._local_snps) > self.LOCAL_CACHE_SIZE:
+                self._local_snps.popitem(last=False)
+    
+    def _local_clear(self, dataset_name: str):
+        """Drop a dataset's entries from the in-process LRU"""
+        with self._local_lock:
+            for key in [key for key in self._local_snps if key[0] == dataset_name]:
+                del self._local_snps[key]
+    
+    # Minimum seconds between reconnection probes while disconnected
+    PING_INTERVAL = 30
+    
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
+        """
+        Check if Redis is connected
+        
+        Returns the cached connection state; redis-py's health check and the
+        error handling in each method keep it current. While disconnected, a
+        PING is retried at most once every PING_INTERVAL seconds.
+        """
         if not self.client:
             return False
+        if not self.connected and time.monotonic() - self._last_ping >= self.PING_INTERVAL:
+            self.ping()
+        return self.connected
+    
+    def ping(self) -> bool:
+        """Ping Redis and update the cached connection state"""
+        if not self.client:
+            return False
+        self._last_ping = time.monotonic()
         try:
             self.client.ping()
-            return True
-        except:
-            return False
+            self.connected = True
+        except (ConnectionError, TimeoutError):
+            self.connected = False
+        return self.connected
     
-    def _get_index_key(self, dataset_name: str) -> str:
+    def _handle_error(self, message: str, error: Exception):
+        """Log a Redis error, marking the cache disconnected on connection failures"""
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            self.connected = False
+            self._last_ping = time.monotonic()
+        logger.error(f"{message}: {error}")
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_index_key(dataset_name: str) -> str:
         """Get Redis key for SNP index"""
-        return f"snp:index:{dataset_name}"
+        return f"snp:index:{_VALUE_NS}{dataset_name}"
     
     def _get_snp_key(self, dataset_name: str, chromosome: str, position: int) -> str:
         """Get Redis key for a specific SNP"""
-        return f"snp:data:{dataset_name}:{chromosome}:{position}"
+        return f"snp:data:{_VALUE_NS}{dataset_name}:{chromosome}:{position}"
     
     def _get_region_key(self, dataset_name: str, chromosome: str, start: int, end: int) -> str:
         """Get Redis key for a region query"""
-        return f"snp:region:{dataset_name}:{chromosome}:{start}:{end}"
+        return f"snp:region:{_VALUE_NS}{dataset_name}:{chromosome}:{start}:{end}"
     
-    def _get_metadata_key(self, dataset_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_metadata_key(dataset_name: str) -> str:
         """Get Redis key for dataset metadata"""
         return f"snp:meta:{dataset_name}"
     
@@ -89,7 +215,7 @@ class RedisCache:
             key = self._get_index_key(dataset_name)
             return self.client.exists(key) > 0
         except Exception as e:
-            logger.error(f"Error checking index cache: {e}")
+            self._handle_error("Error checking index cache", e)
             return False
     
     def cache_index(self, dataset_name: str, index_data: Dict[Tuple[str, int], Dict], 
@@ -107,12 +233,16 @@ class RedisCache:
             logger.warning("Redis not connected, skipping cache")
             return
         
+        index_key = self._get_index_key(dataset_name)
+        # The hash is built under a temporary key and renamed into place once
+        # complete, so a load that fails partway never leaves a partial index
+        # that cache_index_exists() would report as cached
+        loading_key = f"{index_key}:loading:{uuid.uuid4().hex}"
         try:
-            index_key = self._get_index_key(dataset_name)
-            
             # Store index as hash for efficient lookup
-            # Use pipeline for batch operations
-            pipe = self.client.pipeline()
+            # Use a non-transactional pipeline, flushed in bounded chunks so
+            # the client-side buffer never holds the whole index at once
+            pipe = self.client.pipeline(transaction=False)
             
             # Store metadata
             if metadata:
@@ -120,29 +250,57 @@ class RedisCache:
                 pipe.hset(meta_key, mapping=metadata)
                 pipe.expire(meta_key, ttl)
             
-            # Store index entries
-            # We'll store as JSON strings in a hash
-            index_hash = {}
-            for (chrom, pos), snp_info in index_data.items():
-                snp_key = f"{chrom}:{pos}"
-                index_hash[snp_key] = json.dumps(snp_info)
+            # Store index entries as msgpack-encoded values in a hash,
+            # encoding lazily as each batch is assembled
+            def entries():
+                # Indices are grouped by chromosome, so reuse the field prefix
+                # across each contiguous run instead of formatting it per entry
+                current_chrom = None
+                prefix = ""
+                for (chrom, pos), snp_info in index_data.items():
+                    if chrom != current_chrom:
+                        current_chrom = chrom
+                        prefix = f"{chrom}:"
+                    yield prefix + str(pos), _encode_snp(snp_info)
             
-            # Store in batches to avoid memory issues
-            batch_size = 10000
-            items = list(index_hash.items())
-            for i in range(0, len(items), batch_size):
-                batch = dict(items[i:i + batch_size])
-                pipe.hset(index_key, mapping=batch)
+            encoded = entries()
+            pending = 0
+            written = 0
+            while True:
+                batch = dict(islice(encoded, HSET_BATCH_SIZE))
+                if not batch:
+                    break
+                pipe.hset(loading_key, mapping=batch)
+                if not written:
+                    # Queued with the first batch so even an abandoned load expires
+                    pipe.expire(loading_key, ttl)
+                pending += len(batch)
+                written += len(batch)
+                if pending >= PIPELINE_FLUSH_EVERY:
+                    pipe.execute()
+                    pending = 0
             
-            pipe.expire(index_key, ttl)
+            # RENAME keeps the TTL and atomically replaces any previous index
+            if written:
+                pipe.rename(loading_key, index_key)
             pipe.execute()
             
+            self._local_clear(dataset_name)
             logger.info(f"Cached SNP index for {dataset_name}: {len(index_data)} entries")
         except Exception as e:
-            logger.error(f"Error caching index: {e}")
+            self._handle_error("Error caching index", e)
+            try:
+                self.client.unlink(loading_key)
+            except Exception:
+                pass
     
     def get_cached_snp(self, dataset_name: str, chromosome: str, position: int) -> Optional[Dict]:
         """Get a single SNP from cache"""
+        local_key = (dataset_name, chromosome, position)
+        snp = self._local_get(local_key)
+        if snp is not None:
+            return snp
+        
         if not self.is_connected():
             return None
         
@@ -152,12 +310,43 @@ class RedisCache:
             cached = self.client.hget(index_key, snp_key)
             
             if cached:
-                return json.loads(cached)
+                snp = _decode_snp(cached)
+                self._local_put(local_key, snp)
+                return snp
             return None
         except Exception as e:
-            logger.error(f"Error getting cached SNP: {e}")
+            self._handle_error("Error getting cached SNP", e)
             return None
     
+    def get_cached_snps_bulk(self, dataset_name: str, positions: List[Tuple[str, int]]) -> List[Optional[Dict]]:
+        """
+        Get many SNPs from cache in a single HMGET round-trip
+        
+        Args:
+            dataset_name: Name of the dataset
+            positions: List of (chromosome, position) tuples
+            
+        Returns:
+            List aligned with positions; None where a SNP is not cached
+        """
+        results = [self._local_get((dataset_name, chrom, pos)) for chrom, pos in positions]
+        missing = [i for i, snp in enumerate(results) if snp is None]
+        if not missing or not self.is_connected():
+            return results
+        
+        try:
+            index_key = self._get_index_key(dataset_name)
+            cached = self.client.hmget(index_key, [f"{positions[i][0]}:{positions[i][1]}" for i in missing])
+            for i, value in zip(missing, cached):
+                if value:
+                    snp = _decode_snp(value)
+                    self._local_put((dataset_name, *positions[i]), snp)
+                    results[i] = snp
+            return results
+        except Exception as e:
+            self._handle_error("Error getting cached SNPs", e)
+            return results
+    
     def get_cached_region(self, dataset_name: str, chromosome: str, start: int, end: int) -> Optional[List[Dict]]:
         """Get cached SNPs in a region"""
         if not self.is_connected():
@@ -168,10 +357,10 @@ class RedisCache:
             cached = self.client.get(region_key)
             
             if cached:
-                return json.loads(cached)
+                return _decode_region(cached)
             return None
         except Exception as e:
-            logger.error(f"Error getting cached region: {e}")
+            self._handle_error("Error getting cached region", e)
             return None
     
     def cache_region(self, dataset_name: str, chromosome: str, start: int, end: int, 
@@ -182,9 +371,9 @@ class RedisCache:
         
         try:
             region_key = self._get_region_key(dataset_name, chromosome, start, end)
-            self.client.setex(region_key, ttl, json.dumps(snps))
+            self.client.setex(region_key, ttl, _encode_region(snps))
         except Exception as e:
-            logger.error(f"Error caching region: {e}")
+            self._handle_error("Error caching region", e)
     
     def get_cached_metadata(self, dataset_name: str) -> Optional[Dict]:
         """Get cached dataset metadata"""
@@ -193,39 +382,81 @@ class RedisCache:
         
         try:
             meta_key = self._get_metadata_key(dataset_name)
-            return self.client.hgetall(meta_key)
+            metadata = self.client.hgetall(meta_key)
+            if self.decode_responses:
+                return {k.decode(): v.decode() for k, v in metadata.items()}
+            return metadata
         except Exception as e:
-            logger.error(f"Error getting cached metadata: {e}")
+            self._handle_error("Error getting cached metadata", e)
             return None
     
     def invalidate_dataset(self, dataset_name: str):
         """Invalidate all cache entries for a dataset"""
+        self._local_clear(dataset_name)
         if not self.is_connected():
             return
         
         try:
-            pattern = f"snp:*:{dataset_name}*"
-            keys = self.client.keys(pattern)
-            if keys:
-                self.client.delete(*keys)
-                logger.info(f"Invalidated cache for {dataset_name}: {len(keys)} keys")
+            # Only the key families this cache writes for the dataset; exact
+            # keys are unlinked directly, per-item families are scanned
+            exact_keys = [self._get_index_key(dataset_name), self._get_metadata_key(dataset_name)]
+            patterns = [
+                f"snp:data:{_VALUE_NS}{dataset_name}:*",
+                f"snp:region:{_VALUE_NS}{dataset_name}:*"
+            ]
+            
+            # UNLINK frees memory in the background instead of blocking Redis
+            removed = self.client.unlink(*exact_keys)
+            
+            pipe = self.client.pipeline(transaction=False)
+            batch_size = 500
+            for pattern in patterns:
+                batch = []
+                for key in self.client.scan_iter(match=pattern, count=1000):
+                    batch.append(key)
+                    if len(batch) >= batch_size:
+                        pipe.unlink(*batch)
+                        removed += sum(pipe.execute())
+                        batch = []
+                if batch:
+                    pipe.unlink(*batch)
+                    removed += sum(pipe.execute())
+            
+            if removed:
+                logger.info(f"Invalidated cache for {dataset_name}: {removed} keys")
         except Exception as e:
-            logger.error(f"Error invalidating cache: {e}")
+            self._handle_error("Error invalidating cache", e)
+    
+    # Seconds a stats snapshot is served before Redis is queried again
+    STATS_TTL = 5
+    _stats_snapshot: Optional[Tuple[float, Dict[str, Any]]] = None
     
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        if not self.is_connected():
+        """Get cache statistics, refreshed at most once every STATS_TTL seconds"""
+        if not self.client:
             return {"connected": False}
         
+        now = time.monotonic()
+        if self._stats_snapshot is not None and now - self._stats_snapshot[0] < self.STATS_TTL:
+            return self._stats_snapshot[1]
+        
         try:
-            info = self.client.info("memory")
-            return {
+            # INFO and DBSIZE share one round-trip; success also confirms the connection
+            pipe = self.client.pipeline(transaction=False)
+            pipe.info("memory")
+            pipe.dbsize()
+            info, keyspace = pipe.execute()
+            self.connected = True
+            self._last_ping = now
+            stats = {
                 "connected": True,
                 "used_memory": info.get("used_memory_human", "N/A"),
                 "used_memory_peak": info.get("used_memory_peak_human", "N/A"),
-                "keyspace": self.client.dbsize()
+                "keyspace": keyspace
             }
+            self._stats_snapshot = (now, stats)
+            return stats
         except Exception as e:
-            logger.error(f"Error getting cache stats: {e}")
+            self._handle_error("Error getting cache stats", e)
             return {"connected": False, "error": str(e)}
 
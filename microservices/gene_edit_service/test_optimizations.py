@@ -2,12 +2,17 @@
 Test script for optimized gene_edit_service with Redis caching and dataset management
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from typing import Dict, Any
 
 BASE_URL = "http://localhost:8001"
 
+# Reuse pooled connections so timings measure the service, not TCP setup
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 
 def print_section(title: str):
     """Print a formatted section header"""
@@ -19,7 +24,7 @@ def print_section(title: str):
 def check_health() -> Dict[str, Any]:
     """Check service health"""
     print("Checking service health...")
-    response = requests.get(f"{BASE_URL}/health")
+    response = session.get(f"{BASE_URL}/health")
     response.raise_for_status()
     health = response.json()
     
@@ -41,7 +46,7 @@ def test_datasets():
     
     # List all datasets
     print("1. Listing all available datasets...")
-    response = requests.get(f"{BASE_URL}/api/v1/datasets")
+    response = session.get(f"{BASE_URL}/api/v1/datasets")
     response.raise_for_status()
     datasets = response.json()
     
@@ -51,7 +56,7 @@ def test_datasets():
     
     # List categories
     print("\n2. Listing dataset categories...")
-    response = requests.get(f"{BASE_URL}/api/v1/datasets/categories")
+    response = session.get(f"{BASE_URL}/api/v1/datasets/categories")
     response.raise_for_status()
     categories = response.json()
     
@@ -62,7 +67,7 @@ def test_datasets():
     # Get specific dataset info
     if datasets:
         print(f"\n3. Getting info for '{datasets[0]['name']}' dataset...")
-        response = requests.get(f"{BASE_URL}/api/v1/datasets/{datasets[0]['name']}")
+        response = session.get(f"{BASE_URL}/api/v1/datasets/{datasets[0]['name']}")
         response.raise_for_status()
         dataset_info = response.json()
         print(f"   Name: {dataset_info['name']}")
@@ -77,7 +82,7 @@ def test_redis_cache():
     
     # Get cache stats
     print("1. Getting Redis cache statistics...")
-    response = requests.get(f"{BASE_URL}/api/v1/cache/stats")
+    response = session.get(f"{BASE_URL}/api/v1/cache/stats")
     response.raise_for_status()
     stats = response.json()
     
@@ -107,7 +112,7 @@ def test_dataset_selection():
     }
     
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     result1 = response.json()
     time1 = time.time() - start_time
@@ -122,7 +127,7 @@ def test_dataset_selection():
     payload["dataset_name"] = "rice"
     
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     result2 = response.json()
     time2 = time.time() - start_time
@@ -139,7 +144,7 @@ def test_dataset_selection():
     payload["dna_sequence"] = example_sequence + " rice genome sequence"
     
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     result3 = response.json()
     time3 = time.time() - start_time
@@ -155,7 +160,7 @@ def test_dataset_selection():
     payload["dataset_category"] = "cereals"
     
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     result4 = response.json()
     time4 = time.time() - start_time
@@ -171,7 +176,7 @@ def test_snp_queries():
     
     # Test SNP query by position
     print("1. Querying SNPs by position (default dataset)...")
-    response = requests.get(f"{BASE_URL}/api/v1/snps/1/10000", params={"window": 1000})
+    response = session.get(f"{BASE_URL}/api/v1/snps/1/10000", params={"window": 1000})
     response.raise_for_status()
     result = response.json()
     
@@ -184,7 +189,7 @@ def test_snp_queries():
     
     # Test SNP query with specific dataset
     print("\n2. Querying SNPs with specific dataset (maize)...")
-    response = requests.get(
+    response = session.get(
         f"{BASE_URL}/api/v1/snps/1/10000",
         params={"window": 1000, "dataset": "maize"}
     )
@@ -211,7 +216,7 @@ def test_performance():
     }
     
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     time1 = time.time() - start_time
     print(f"   ✓ Completed in {time1:.2f}s")
@@ -219,7 +224,7 @@ def test_performance():
     # Second request (should use cache)
     print("\n2. Second request (should use cache)...")
     start_time = time.time()
-    response = requests.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
+    response = session.post(f"{BASE_URL}/api/v1/gene-edit/suggest", json=payload)
     response.raise_for_status()
     time2 = time.time() - start_time
     print(f"   ✓ Completed in {time2:.2f}s")
@@ -235,7 +240,7 @@ def test_performance():
     times = []
     for i in range(3):
         start_time = time.time()
-        response = requests.get(f"{BASE_URL}/api/v1/snps/1/50000", params={"window": 500})
+        response = session.get(f"{BASE_URL}/api/v1/snps/1/50000", params={"window": 500})
         response.raise_for_status()
         times.append(time.time() - start_time)
     
@@ -0,0 +1,49 @@
+from typing import Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. After fail_max failures calls are
+    refused for reset_timeout seconds, then a single trial call is let through;
+    everyone else is refused until it records its outcome. A trial that never
+    reports back is replaced after another reset_timeout.
+    """
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+    
+    def allow_request(self) -> bool:
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        started = self._trial_started if self._trial_started is not None else self._opened_at
+        if now - started < self.reset_timeout:
+            return False
+        # Half-open: the circuit stays open for everyone but this trial call
+        self._trial_started = now
+        return True
+    
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started = None
+    
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_started is not None:
+            # The trial failed; stay open for another reset_timeout
+            self._trial_started = None
+            self._opened_at = time.monotonic()
+            logger.warning("Circuit trial call failed; staying open")
+            return
+        if self._failures >= self.fail_max and self._opened_at is None:
+            self._opened_at = time.monotonic()
+            logger.warning(f"Circuit opened after {self._failures} consecutive failures")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -12,10 +13,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     # CORS Configuration
-    CORS_ORIGINS: list[str] = ["*"]
+    # Explicit origins: a wildcard cannot be combined with credentials
+    CORS_ORIGINS: list[str] = ["http://localhost:3000"]
     
     # Gemini LLM Configuration
     GEMINI_API_KEY: str
+    GEMINI_CONCURRENCY: int = Field(default=8, description="Maximum concurrent blocking Gemini SDK calls")
+    SEMANTIC_CACHE_ENABLED: bool = Field(default=True, description="Reuse answers to paraphrased questions via embedding similarity")
     
     # Redis Configuration
     REDIS_URL: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
@@ -23,6 +27,7 @@ class Settings(BaseSettings):
     
     # Gene Edit Microservice Configuration
     GENE_EDIT_SERVICE_URL: str = Field(default="http://localhost:8001", description="Gene edit microservice URL")
+    ANALYSIS_RETENTION_SECS: int = Field(default=90 * 86400, description="How long unpinned analyses are kept (default: 90 days)")
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -31,5 +36,10 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
 
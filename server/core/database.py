@@ -1,28 +1,71 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import WriteConcern
 from core.config import settings
 from typing import Optional
 
+# History lists a user's analyses newest first; used as an explicit hint
+GENE_ANALYSES_HISTORY_INDEX = [("user_id", 1), ("created_at", -1)]
+
+# Analysis inserts are acknowledged once applied in memory, without waiting for
+# the journal; a lost result can be recomputed from the microservice
+ANALYSIS_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
+    database: Optional[AsyncIOMotorDatabase] = None
 
 db = MongoDB()
 
 async def connect_to_mongo():
     """Create database connection"""
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db.client = AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        maxPoolSize=200,
+        minPoolSize=20,
+        maxIdleTimeMS=60000,
+        serverSelectionTimeoutMS=3000,
+        # Compressors the driver cannot load are skipped; zlib is always available
+        compressors="zstd,snappy,zlib",
+        retryReads=True
+    )
+    db.database = db.client[settings.DATABASE_NAME]
     print(f"Connected to MongoDB: {settings.DATABASE_NAME}")
+    
+    # Unique indexes let registration rely on a single insert (idempotent)
+    try:
+        await db.database.users.create_index("email", unique=True)
+        await db.database.users.create_index("username", unique=True)
+    except Exception as e:
+        print(f"Failed to create user indexes: {e}")
+    try:
+        await db.database.gene_analyses.create_index(GENE_ANALYSES_HISTORY_INDEX)
+        # Unpinned analyses carry expires_at and are purged when it passes
+        await db.database.gene_analyses.create_index("expires_at", expireAfterSeconds=0)
+        # Lets the orphaned-sequence sweep find references without a scan
+        await db.database.gene_analyses.create_index("dna_sequence_ref", sparse=True)
+        # Re-seed per-user analysis counts daily so TTL purges are picked up
+        await db.database.user_stats.create_index("seeded_at", expireAfterSeconds=86400)
+        # Job status records are kept for a day after their last update; the
+        # finished analysis itself lives on in gene_analyses
+        await db.database.gene_analysis_jobs.create_index("updated_at", expireAfterSeconds=86400)
+        # Cached microservice responses expire after a day
+        await db.database.gene_analysis_cache.create_index("created_at", expireAfterSeconds=86400)
+    except Exception as e:
+        print(f"Failed to create gene analysis indexes: {e}")
 
 async def close_mongo_connection():
     """Close database connection"""
     if db.client:
         db.client.close()
+        db.client = None
+        db.database = None
         print("Disconnected from MongoDB")
 
 def get_database():
     """Get database instance"""
-    return db.client[settings.DATABASE_NAME]
+    return db.database
 
 async def get_db():
     """Dependency to get database instance"""
-    return db.client[settings.DATABASE_NAME]
+    return db.database
 
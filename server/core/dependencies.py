@@ -1,17 +1,112 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
 from bson import ObjectId
-from core.config import settings
+from core.security import decode_access_token
 from core.database import get_db
+from core.redis import get_binary_redis
 from model.user import User
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from cachetools import TTLCache
+from datetime import datetime, timezone
+from typing import Optional
+import msgpack
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer(auto_error=False)
 
+# Recently authenticated tokens -> (user_id, exp, User); skips JWT decode and
+# the Mongo lookup on repeat requests. Entries never outlive the token's exp.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+# Only the fields the User model needs
+USER_PROJECTION = {
+    "email": 1,
+    "username": 1,
+    "hashed_password": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+# get_current_user never checks passwords, so the hash is neither fetched nor
+# cached; the resulting User has no hashed_password set
+CURRENT_USER_PROJECTION = {
+    "email": 1,
+    "username": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+# User documents cached in Redis so repeat lookups skip MongoDB. The msgpack
+# bytes go through the binary client, which does not decode responses; the
+# versioned prefix keeps entries in the old latin-1 text layout from being read.
+USER_CACHE_PREFIX = "user:v2:"
+USER_CACHE_TTL = 60
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _pack_user_doc(doc: dict) -> bytes:
+    packed = {key: value for key, value in doc.items() if key != "_id" and key not in _DATETIME_FIELDS}
+    packed["_id"] = str(doc["_id"])
+    for field in _DATETIME_FIELDS:
+        if doc.get(field) is not None:
+            packed[field] = doc[field].replace(tzinfo=timezone.utc).timestamp()
+    return msgpack.packb(packed)
+
+
+def _unpack_user_doc(data: bytes) -> dict:
+    doc = msgpack.unpackb(data)
+    doc["_id"] = ObjectId(doc["_id"])
+    for field in _DATETIME_FIELDS:
+        if field in doc:
+            doc[field] = datetime.fromtimestamp(doc[field], timezone.utc).replace(tzinfo=None)
+    return doc
+
+
+async def _get_cached_user_doc(user_id: str) -> Optional[dict]:
+    redis = get_binary_redis()
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(f"{USER_CACHE_PREFIX}{user_id}")
+        return _unpack_user_doc(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"Error reading cached user: {str(e)}")
+        return None
+
+
+async def _cache_user_doc(user_id: str, doc: dict) -> None:
+    redis = get_binary_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(f"{USER_CACHE_PREFIX}{user_id}", _pack_user_doc(doc), ex=USER_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Error caching user: {str(e)}")
+
+
+async def invalidate_cached_user(user_id: str) -> None:
+    """
+    Drop a user's cached document; call after changing the user in MongoDB
+    """
+    redis = get_binary_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"{USER_CACHE_PREFIX}{user_id}")
+    except Exception as e:
+        logger.warning(f"Error invalidating cached user: {str(e)}")
+
+
 async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -36,10 +131,20 @@ async def get_current_user(
         if not token:
             logger.warning("Authentication failed: Empty token provided")
             raise credentials_exception
+        
+        cache_key = _token_cache_key(token)
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            user_id, exp, user = cached
+            if exp is None or exp > time.time():
+                request.state.user_id = user_id
+                return user
+            _token_cache.pop(cache_key, None)
             
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
+        if payload is None:
+            logger.warning("Authentication failed: Invalid or expired token")
+            raise credentials_exception
         user_id: str = payload.get("sub")
         if user_id is None:
             logger.warning("Authentication failed: No user ID in token payload")
@@ -51,8 +156,14 @@ async def get_current_user(
         logger.error(f"Authentication error: {str(e)}")
         raise credentials_exception
     
+    user = await _get_cached_user_doc(user_id)
+    if user is not None:
+        user = User.model_construct(**user)
+        _token_cache[cache_key] = (user_id, payload.get("exp"), user)
+        return user
+    
     try:
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
+        user = await db.users.find_one({"_id": ObjectId(user_id)}, projection=CURRENT_USER_PROJECTION)
         if user is None:
             logger.warning(f"Authentication failed: User not found with ID {user_id}")
             raise credentials_exception
@@ -60,5 +171,8 @@ async def get_current_user(
         logger.error(f"Database error during authentication: {str(e)}")
         raise credentials_exception
     
-    return User(**user)
+    await _cache_user_doc(user_id, user)
+    user = User.model_construct(**user)
+    _token_cache[cache_key] = (user_id, payload.get("exp"), user)
+    return user
 
@@ -0,0 +1,50 @@
+import httpx
+from fastapi import Request
+from core.config import settings
+from services.ollama import OLLAMA_BASE_URL
+from core.circuit_breaker import CircuitBreaker
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def connect_http_clients(app) -> None:
+    """Create the app-lifetime HTTP clients for the gene edit microservice and Ollama"""
+    # Keep-alive pool reused across analyses; 5 minute read timeout for ML processing,
+    # short connect/pool timeouts so an unreachable service fails fast
+    app.state.microservice_client = httpx.AsyncClient(
+        base_url=settings.GENE_EDIT_SERVICE_URL,
+        timeout=httpx.Timeout(connect=5.0, read=300.0, write=30.0, pool=5.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30)
+    )
+    logger.info(f"Microservice HTTP client ready: {settings.GENE_EDIT_SERVICE_URL}")
+    
+    # Summaries stream from the local Ollama server; the read timeout is per chunk
+    app.state.ollama_client = httpx.AsyncClient(
+        base_url=OLLAMA_BASE_URL,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
+
+
+async def close_http_clients(app) -> None:
+    """Close the app-lifetime HTTP clients"""
+    for name in ("microservice_client", "ollama_client"):
+        client = getattr(app.state, name, None)
+        if client is not None:
+            await client.aclose()
+            setattr(app.state, name, None)
+
+
+def get_microservice_client(request: Request) -> httpx.AsyncClient:
+    """Dependency returning the shared microservice client"""
+    return request.app.state.microservice_client
+
+
+def get_ollama_client(request: Request) -> httpx.AsyncClient:
+    """Dependency returning the shared Ollama client"""
+    return request.app.state.ollama_client
+
+
+# Shared by all gene edit microservice calls in this process
+microservice_breaker = CircuitBreaker(fail_max=5, reset_timeout=60.0)
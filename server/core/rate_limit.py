@@ -6,9 +6,12 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, HTTPException, status
 from core.redis import get_redis
+from redis.exceptions import RedisError, NoScriptError
 from core.config import settings
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,7 @@ try:
     limiter = Limiter(
         key_func=get_limiter_key,
         storage_uri=redis_url,
+        strategy="fixed-window",
         default_limits=["1000/hour"]  # Default limit if not specified
     )
     logger.info(f"Rate limiter initialized with Redis backend: {redis_url}")
@@ -66,3 +70,274 @@ def get_rate_limit(limit_name: str) -> str:
     """Get rate limit string for a given limit name"""
     return RATE_LIMITS.get(limit_name, RATE_LIMITS["default"])
 
+
+# Seconds per unit for rate limit strings such as "30/hour"
+_WINDOW_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+
+
+def parse_rate_limit(limit: str) -> Tuple[int, int]:
+    """Parse a rate limit string like "30/hour" into (amount, window in milliseconds)"""
+    amount, unit = limit.split("/", 1)
+    return int(amount), _WINDOW_SECONDS[unit.strip().rstrip("s")] * 1000
+
+
+# Limits and key prefixes resolved once at import so hits skip string parsing
+PARSED_LIMITS: Dict[str, Tuple[int, int]] = {
+    name: parse_rate_limit(limit) for name, limit in RATE_LIMITS.items()
+}
+_KEY_PREFIXES: Dict[str, str] = {
+    name: f"{RATE_LIMIT_KEY_PREFIX}{name}:" for name in RATE_LIMITS
+}
+
+
+def get_rate_limit_parsed(limit_name: str) -> Tuple[int, int]:
+    """Get (amount, window in milliseconds) for a given limit name"""
+    parsed = PARSED_LIMITS.get(limit_name)
+    if parsed is None:
+        parsed = PARSED_LIMITS[limit_name] = parse_rate_limit(get_rate_limit(limit_name))
+    return parsed
+
+
+def rate_limit_key(request: Request, limit_name: str) -> str:
+    """Redis key holding the fixed-window counter for a limit and caller"""
+    prefix = _KEY_PREFIXES.get(limit_name) or f"{RATE_LIMIT_KEY_PREFIX}{limit_name}:"
+    return prefix + get_limiter_key(request)
+
+
+# Fixed-window counter: O(1) per hit, one key per caller, one round-trip.
+# ARGV[2] optionally adds several hits at once; the window starts when the key is
+# created, i.e. when the count equals the hits just added. Returns {hit count, remaining window in ms}.
+FIXED_WINDOW_SCRIPT = """
+local n = tonumber(ARGV[2] or 1)
+local c = redis.call('INCRBY', KEYS[1], n)
+if c == n then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end
+return {c, redis.call('PTTL', KEYS[1])}
+"""
+
+_script_sha: Optional[str] = None
+
+
+async def load_rate_limit_script() -> Optional[str]:
+    """SCRIPT LOAD the fixed-window counter; called at startup and after NOSCRIPT"""
+    global _script_sha
+    redis = get_redis()
+    if redis is None:
+        return None
+    _script_sha = await redis.script_load(FIXED_WINDOW_SCRIPT)
+    return _script_sha
+
+
+def enforce_rate_limit(limit_name: str, count: int, remaining_ms: int) -> None:
+    """Raise 429 if a fixed-window hit count is over the limit"""
+    amount, window_ms = get_rate_limit_parsed(limit_name)
+    if count > amount:
+        retry_after = max(1, (remaining_ms if remaining_ms > 0 else window_ms) // 1000)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded: {get_rate_limit(limit_name)}. Please try again later.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+# In-process fallback windows used while Redis is unavailable: key -> (count, window end)
+_local_windows: Dict[str, Tuple[int, float]] = {}
+
+
+def hit_local_rate_limit(request: Request, limit_name: str) -> None:
+    """Count a hit against an in-process fixed window and enforce the limit"""
+    key = rate_limit_key(request, limit_name)
+    _, window_ms = get_rate_limit_parsed(limit_name)
+    now = time.monotonic()
+    if len(_local_windows) > 10_000:
+        for stale in [k for k, (_, end) in _local_windows.items() if end <= now]:
+            del _local_windows[stale]
+    count, window_end = _local_windows.get(key, (0, 0.0))
+    if now >= window_end:
+        count, window_end = 0, now + window_ms / 1000
+    count += 1
+    _local_windows[key] = (count, window_end)
+    enforce_rate_limit(limit_name, count, int((window_end - now) * 1000))
+
+
+async def rate_limited_pipeline(
+    request: Request,
+    limit_name: str,
+    queue_extra: Optional[Callable[[Any], None]] = None
+) -> Optional[List[Any]]:
+    """
+    Enforce a fixed-window rate limit, optionally batching extra Redis commands
+    into the same pipeline so they share one round-trip.
+    Returns the replies of the extra commands, or None if Redis was unavailable.
+    """
+    redis = get_redis()
+    if redis is None:
+        hit_local_rate_limit(request, limit_name)
+        return None
+    
+    key = rate_limit_key(request, limit_name)
+    _, window_ms = get_rate_limit_parsed(limit_name)
+    
+    try:
+        for attempt in range(2):
+            if _script_sha is None:
+                await load_rate_limit_script()
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.evalsha(_script_sha, 1, key, window_ms)
+                    if queue_extra is not None:
+                        queue_extra(pipe)
+                    replies = await pipe.execute()
+                break
+            except NoScriptError:
+                # Script cache was flushed (e.g. Redis restart); reload once and retry
+                if attempt:
+                    raise
+                await load_rate_limit_script()
+    except RedisError as e:
+        logger.warning(f"Rate limit check failed on Redis, using in-process window: {e}")
+        hit_local_rate_limit(request, limit_name)
+        return None
+    
+    count, remaining_ms = replies[0]
+    enforce_rate_limit(limit_name, count, remaining_ms)
+    return replies[1:]
+
+
+# Fire-and-forget counting: hits are enforced against an in-process estimate and
+# flushed to Redis in batches by a background task, which syncs the global count
+# back. key -> [synced count, unflushed hits, window end]
+_fire_windows: Dict[str, List[Any]] = {}
+_fire_queue: Optional[asyncio.Queue] = None
+FIRE_BATCH_SIZE = 64
+FIRE_FLUSH_INTERVAL = 0.005
+# Pause after a failed flush before the requeued hits are retried
+FIRE_RETRY_DELAY = 1.0
+
+
+def hit_fire_and_forget(request: Request, limit_name: str) -> None:
+    """Count a hit locally, queue it for the Redis flusher and enforce the estimate"""
+    key = rate_limit_key(request, limit_name)
+    _, window_ms = get_rate_limit_parsed(limit_name)
+    now = time.monotonic()
+    if len(_fire_windows) > 10_000:
+        for stale in [k for k, state in _fire_windows.items() if state[2] <= now and not state[1]]:
+            del _fire_windows[stale]
+    state = _fire_windows.get(key)
+    if state is None or now >= state[2]:
+        state = _fire_windows[key] = [0, 0, now + window_ms / 1000]
+    state[1] += 1
+    if state[1] == 1:
+        # Queued once per flush; the flusher sends whatever has accumulated
+        _fire_queue.put_nowait((key, window_ms))
+    enforce_rate_limit(limit_name, state[0] + state[1], int((state[2] - now) * 1000))
+
+
+def _requeue_hits(sends: List[Tuple[str, int, int, List[Any]]]) -> None:
+    """Return unsent hits to their windows so the next flush sends them"""
+    for key, window_ms, hits, state in sends:
+        if _fire_windows.get(key) is not state:
+            # The window rolled over meanwhile; its hits no longer count
+            continue
+        state[0] -= hits
+        state[1] += hits
+        if state[1] == hits and _fire_queue is not None:
+            # No hit arrived since the send, so nothing has queued the key
+            _fire_queue.put_nowait((key, window_ms))
+
+
+async def _flush_batch(batch: List[Tuple[str, int]]) -> bool:
+    """
+    Send accumulated hits for a batch of keys in one pipeline and sync counts back.
+    Returns False if Redis could not be reached; the hits are requeued.
+    """
+    sends = []
+    for key, window_ms in batch:
+        state = _fire_windows.get(key)
+        if state is None or not state[1]:
+            continue
+        # Counted as synced while in flight so the local estimate still includes them
+        hits, state[1] = state[1], 0
+        state[0] += hits
+        sends.append((key, window_ms, hits, state))
+    if not sends:
+        return True
+    
+    redis = get_redis()
+    try:
+        if redis is None:
+            raise RedisError("Redis is not available")
+        for attempt in range(2):
+            if _script_sha is None:
+                await load_rate_limit_script()
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key, window_ms, hits, _ in sends:
+                        pipe.evalsha(_script_sha, 1, key, window_ms, hits)
+                    replies = await pipe.execute()
+                break
+            except NoScriptError:
+                # Script cache was flushed (e.g. Redis restart); reload once and retry
+                if attempt:
+                    raise
+                await load_rate_limit_script()
+    except RedisError as e:
+        logger.warning(f"Rate limit flush failed, requeueing hits: {e}")
+        _requeue_hits(sends)
+        return False
+    
+    now = time.monotonic()
+    for (_, _, _, state), (count, remaining_ms) in zip(sends, replies):
+        # Global count across workers; hits queued meanwhile are still in state[1]
+        state[0] = count
+        if remaining_ms > 0:
+            state[2] = now + remaining_ms / 1000
+    return True
+
+
+async def _run_flusher(queue: asyncio.Queue) -> None:
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(FIRE_FLUSH_INTERVAL)
+        while len(batch) < FIRE_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            if not await _flush_batch(batch):
+                await asyncio.sleep(FIRE_RETRY_DELAY)
+        except Exception as e:
+            logger.error(f"Unexpected error flushing rate limit hits: {e}")
+
+
+def start_rate_limit_flusher() -> asyncio.Task:
+    """Start the background task that batches rate limit hits into Redis"""
+    global _fire_queue
+    _fire_queue = asyncio.Queue()
+    return asyncio.create_task(_run_flusher(_fire_queue))
+
+
+async def stop_rate_limit_flusher(task: asyncio.Task) -> None:
+    """Stop the flusher; later hits go back to the synchronous path"""
+    global _fire_queue
+    _fire_queue = None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def check_rate_limit(request: Request, limit_name: str) -> None:
+    """
+    Enforce a fixed-window rate limit. With the flusher running the Redis write
+    is off the request path; otherwise a single EVALSHA round-trip is awaited.
+    """
+    if _fire_queue is not None:
+        hit_fire_and_forget(request, limit_name)
+        return
+    await rate_limited_pipeline(request, limit_name)
@@ -1,4 +1,4 @@
-from redis.asyncio import Redis
+from redis.asyncio import Redis, ConnectionPool
 from core.config import settings
 from typing import Optional
 import logging
@@ -7,32 +7,71 @@ logger = logging.getLogger(__name__)
 
 class RedisClient:
     client: Optional[Redis] = None
+    pool: Optional[ConnectionPool] = None
+    # Same server without response decoding, for values stored as raw bytes
+    binary_client: Optional[Redis] = None
+    binary_pool: Optional[ConnectionPool] = None
 
 redis_client = RedisClient()
 
 async def connect_to_redis():
     """Create Redis connection"""
     try:
-        redis_client.client = Redis.from_url(
+        # Bounded pool shared by the whole app so connections are reused
+        redis_client.pool = ConnectionPool.from_url(
             settings.REDIS_URL,
+            max_connections=100,
             encoding="utf-8",
-            decode_responses=True
+            decode_responses=True,
+            health_check_interval=30,
+            socket_keepalive=True,
+            socket_timeout=2.0
         )
+        redis_client.client = Redis(connection_pool=redis_client.pool)
         # Test connection
         await redis_client.client.ping()
+        redis_client.binary_pool = ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=50,
+            decode_responses=False,
+            health_check_interval=30,
+            socket_keepalive=True,
+            socket_timeout=2.0
+        )
+        redis_client.binary_client = Redis(connection_pool=redis_client.binary_pool)
         logger.info(f"Connected to Redis: {settings.REDIS_URL}")
     except Exception as e:
         logger.warning(f"Failed to connect to Redis: {str(e)}. Caching will be disabled.")
         # Set client to None so cache functions know Redis is unavailable
+        for pool in (redis_client.pool, redis_client.binary_pool):
+            if pool:
+                await pool.disconnect()
         redis_client.client = None
+        redis_client.pool = None
+        redis_client.binary_client = None
+        redis_client.binary_pool = None
 
 async def close_redis_connection():
     """Close Redis connection"""
     if redis_client.client:
         await redis_client.client.close()
+        redis_client.client = None
+    if redis_client.binary_client:
+        await redis_client.binary_client.close()
+        redis_client.binary_client = None
+    if redis_client.binary_pool:
+        await redis_client.binary_pool.disconnect()
+        redis_client.binary_pool = None
+    if redis_client.pool:
+        await redis_client.pool.disconnect()
+        redis_client.pool = None
         logger.info("Disconnected from Redis")
 
 def get_redis() -> Optional[Redis]:
     """Get Redis client instance. Returns None if Redis is not available."""
     return redis_client.client
 
+def get_binary_redis() -> Optional[Redis]:
+    """Get the Redis client that returns raw bytes. Returns None if Redis is not available."""
+    return redis_client.binary_client
+
@@ -1,63 +1,119 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
-from passlib.context import CryptContext
-from jose import jwt
+from functools import lru_cache
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cachetools import TTLCache
+import bcrypt
+import hashlib
+import threading
+import time
+import jwt
 from core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id for new hashes; bcrypt only verifies legacy hashes
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Signing key and decode configuration built once so per-token work is only
+# the single verified decode
+_KEY_BYTES = settings.SECRET_KEY.encode()
+_ALGORITHMS = [settings.ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False}
+_DEFAULT_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Kept for callers that catch the python-jose exception name
+JWTError = jwt.InvalidTokenError
+
+# Verified payloads keyed by token digest; only valid tokens are cached and
+# entries are re-checked against their own exp claim on every hit
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_payload_cache_lock = threading.Lock()
+
+
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def _truncate_for_bcrypt(password: str) -> bytes:
+    """
+    Truncate a password to bcrypt's 72-byte limit without splitting a UTF-8 sequence
+    """
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) <= 72:
+        return password_bytes
+    # Drop a trailing partial sequence, matching the bytes legacy hashes were made from
+    return password_bytes[:72].decode('utf-8', errors='ignore').encode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash
     """
-    # Truncate password to 72 bytes (bcrypt limit)
-    if isinstance(plain_password, str):
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-            # Decode back, handling potential incomplete UTF-8 sequences
-            try:
-                plain_password = password_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                # If decoding fails, remove the last byte and try again
-                plain_password = password_bytes[:-1].decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
+    if _is_bcrypt_hash(hashed_password):
+        try:
+            return bcrypt.checkpw(_truncate_for_bcrypt(plain_password), hashed_password.encode())
+        except ValueError:
+            return False
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Whether a stored hash is legacy bcrypt or uses outdated argon2 parameters
+    """
+    if _is_bcrypt_hash(hashed_password):
+        return True
+    try:
+        return password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password
     """
-    # Truncate password to 72 bytes (bcrypt limit)
-    if isinstance(password, str):
-        password_bytes = password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-            # Decode back, handling potential incomplete UTF-8 sequences
-            try:
-                password = password_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                # If decoding fails, remove the last byte and try again
-                password = password_bytes[:-1].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+def warm_up_security() -> None:
+    """
+    Exercise the hashing and JWT backends once at startup so the first login
+    doesn't pay for lazy imports and allocations
+    """
+    password_hasher.verify(password_hasher.hash("warmup"), "warmup")
+    bcrypt.checkpw(b"warmup", bcrypt.hashpw(b"warmup", bcrypt.gensalt(rounds=4)))
+    _validate_jwt_config()
+    token = jwt.encode({"sub": "warmup", "exp": int(time.time()) + 60}, _KEY_BYTES, algorithm=settings.ALGORITHM)
+    jwt.decode(token, _KEY_BYTES, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS)
+
+
+@lru_cache(maxsize=1)
+def _validate_jwt_config() -> None:
+    """
+    Check the configured JWT algorithm and key once per process
+    """
+    if settings.ALGORITHM not in jwt.algorithms.get_default_algorithms():
+        raise ValueError(f"Unsupported JWT algorithm: {settings.ALGORITHM}")
+    if not _KEY_BYTES:
+        raise ValueError("SECRET_KEY must not be empty")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
     """
+    _validate_jwt_config()
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        to_encode["exp"] = int(time.time()) + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
+        to_encode["exp"] = int(time.time()) + _DEFAULT_EXPIRE_SECONDS
     encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+        to_encode, _KEY_BYTES, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
@@ -66,11 +122,27 @@ def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT access token
     """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _payload_cache_lock:
+        cached = _payload_cache.get(cache_key)
+    if cached is not None:
+        payload, exp = cached
+        if exp > time.time():
+            return payload
+        with _payload_cache_lock:
+            _payload_cache.pop(cache_key, None)
+    
+    _validate_jwt_config()
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token,
+            _KEY_BYTES,
+            algorithms=_ALGORITHMS,
+            options=_DECODE_OPTIONS
         )
+        with _payload_cache_lock:
+            _payload_cache[cache_key] = (payload, payload["exp"])
         return payload
-    except jwt.JWTError:
+    except JWTError:
         return None
 
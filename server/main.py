@@ -1,12 +1,16 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from slowapi.errors import RateLimitExceeded
-from core.database import connect_to_mongo, close_mongo_connection
+from core.database import connect_to_mongo, close_mongo_connection, get_database
 from core.redis import connect_to_redis, close_redis_connection, get_redis
 from core.config import settings
-from core.rate_limit import limiter
+from core.security import warm_up_security
+from core.http_clients import connect_http_clients, close_http_clients
+from core.rate_limit import limiter, load_rate_limit_script, start_rate_limit_flusher, stop_rate_limit_flusher
+from services.analysis_writer import start_analysis_writer, stop_analysis_writer
+from services.sequence_store import start_sequence_sweeper, stop_sequence_sweeper
 from routers import auth, llm, gene_analysis
 import logging
 
@@ -25,6 +29,10 @@ async def lifespan(app : FastAPI):
     logger.info("Starting application...")
     await connect_to_mongo()
     await connect_to_redis()
+    await connect_http_clients(app)
+    warm_up_security()
+    app.state.analysis_writer = start_analysis_writer(get_database())
+    app.state.sequence_sweeper = start_sequence_sweeper(get_database())
     
     # Check Redis connection status
     redis_client = get_redis()
@@ -32,6 +40,8 @@ async def lifespan(app : FastAPI):
         try:
             await redis_client.ping()
             logger.info("✓ Redis is connected and ready for caching")
+            app.state.rate_limit_sha = await load_rate_limit_script()
+            app.state.rate_limit_flusher = start_rate_limit_flusher()
         except Exception as e:
             logger.warning(f"✗ Redis connection check failed: {str(e)}")
     else:
@@ -40,20 +50,40 @@ async def lifespan(app : FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    flusher = getattr(app.state, "rate_limit_flusher", None)
+    if flusher is not None:
+        await stop_rate_limit_flusher(flusher)
+    await stop_analysis_writer(app.state.analysis_writer)
+    await stop_sequence_sweeper(app.state.sequence_sweeper)
+    await close_http_clients(app)
     await close_redis_connection()
     await close_mongo_connection()
     logger.info("Application shutdown complete")
     
 app = FastAPI(title="AgroTerror",
               lifespan=lifespan,
+              default_response_class=ORJSONResponse,
               description="AI Tool which can predict crop growth and yield by alternating genes using CRISPR technology",
               version="1.0.0",
               docs_url="/docs",
               redoc_url="/redoc"
     )
 
+class OriginSetCORSMiddleware(CORSMiddleware):
+    """CORS middleware that checks origins against a precomputed frozenset"""
+    
+    def __init__(self, app, allow_origins=(), **kwargs):
+        super().__init__(app, allow_origins=allow_origins, **kwargs)
+        self._allowed_origin_set = frozenset(allow_origins)
+    
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins or origin in self._allowed_origin_set:
+            return True
+        return super().is_allowed_origin(origin) if self.allow_origin_regex else False
+
+
 app.add_middleware(
-    CORSMiddleware,
+    OriginSetCORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
@@ -64,7 +94,7 @@ app.add_middleware(
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """Custom handler for rate limit exceeded errors"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "detail": f"Rate limit exceeded: {exc.detail}. Please try again later.",
@@ -87,5 +117,15 @@ async def root():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run("main:app", host="localhost", port=8000, reload=True)
+    # uvloop and httptools ship with uvicorn[standard] (pulled in by fastapi[all]);
+    # use `uvicorn main:app --reload` for development
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count()
+    )
@@ -0,0 +1,7 @@
+from typing import Annotated
+from bson import ObjectId
+from pydantic import PlainSerializer
+
+
+# ObjectId that serializes as its hex string
+PyObjectId = Annotated[ObjectId, PlainSerializer(str, return_type=str)]
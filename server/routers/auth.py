@@ -1,42 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from schemas.auth import UserCreate, UserLogin, Token, UserResponse
-from core.dependencies import get_current_user
+from core.dependencies import USER_PROJECTION, get_current_user, invalidate_cached_user
 from core.database import get_db
-from core.security import get_password_hash, verify_password, create_access_token
-from core.rate_limit import limiter, get_rate_limit
+from core.security import get_password_hash, verify_password, password_needs_rehash, create_access_token
+from core.rate_limit import check_rate_limit
 from model.user import User
 from datetime import timedelta
 from core.config import settings
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Resolved once at import rather than on every request
+_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_HTTP_400 = status.HTTP_400_BAD_REQUEST
+_HTTP_401 = status.HTTP_401_UNAUTHORIZED
+_HTTP_500 = status.HTTP_500_INTERNAL_SERVER_ERROR
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit(get_rate_limit("auth_register"))
 async def register(request: Request, user_data: UserCreate, db: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Register a new user
     """
+    await check_rate_limit(request, "auth_register")
     try:
-        # Check if user with email already exists
-        existing_user = await db.users.find_one({"email": user_data.email})
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        
-        # Check if user with username already exists
-        existing_username = await db.users.find_one({"username": user_data.username})
-        if existing_username:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
-            )
-        
-        # Create new user
+        # Create new user; unique indexes on email and username reject duplicates
         hashed_password = get_password_hash(user_data.password)
         user_dict = {
             "email": user_data.email,
@@ -44,11 +36,23 @@ async def register(request: Request, user_data: UserCreate, db: AsyncIOMotorData
             "hashed_password": hashed_password
         }
         
-        result = await db.users.insert_one(user_dict)
+        try:
+            result = await db.users.insert_one(user_dict)
+        except DuplicateKeyError as e:
+            key_pattern = (e.details or {}).get("keyPattern") or {}
+            if "username" in key_pattern:
+                detail = "Username already taken"
+            else:
+                detail = "Email already registered"
+            raise HTTPException(
+                status_code=_HTTP_400,
+                detail=detail
+            )
+        
         user_dict["_id"] = result.inserted_id
-        user = User(**user_dict)
+        user = User.model_construct(**user_dict)
         
-        return UserResponse(
+        return UserResponse.model_construct(
             id=str(user.id),
             email=user.email,
             username=user.username,
@@ -59,44 +63,51 @@ async def register(request: Request, user_data: UserCreate, db: AsyncIOMotorData
         raise
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=_HTTP_500,
             detail=str(e)
         )
 
 
 @router.post("/login", response_model=Token)
-@limiter.limit(get_rate_limit("auth_login"))
 async def login(request: Request, login_data: UserLogin, db: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Login and get access token
     """
+    await check_rate_limit(request, "auth_login")
     try:
         # Get user by email
-        user_doc = await db.users.find_one({"email": login_data.email})
+        user_doc = await db.users.find_one({"email": login_data.email}, projection=USER_PROJECTION)
         if not user_doc:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
+                status_code=_HTTP_401,
                 detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
+                headers=_BEARER_HEADERS,
             )
         
-        user = User(**user_doc)
+        user = User.model_construct(**user_doc)
         
         # Verify password
         if not verify_password(login_data.password, user.hashed_password):
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
+                status_code=_HTTP_401,
                 detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
+                headers=_BEARER_HEADERS,
+            )
+        
+        # Upgrade legacy bcrypt (or outdated argon2) hashes now that we have the plaintext
+        if password_needs_rehash(user.hashed_password):
+            await db.users.update_one(
+                {"_id": user.id},
+                {"$set": {"hashed_password": get_password_hash(login_data.password)}}
             )
+            await invalidate_cached_user(str(user.id))
         
         # Create access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id)}, expires_delta=access_token_expires
+            data={"sub": str(user.id)}, expires_delta=_TOKEN_EXPIRE
         )
         
-        return Token(
+        return Token.model_construct(
             access_token=access_token,
             token_type="bearer"
         )
@@ -104,19 +115,19 @@ async def login(request: Request, login_data: UserLogin, db: AsyncIOMotorDatabas
         raise
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=_HTTP_500,
             detail=str(e)
         )
 
 
 @router.get("/me", response_model=UserResponse)
-@limiter.limit(get_rate_limit("auth_me"))
 async def get_current_user_info(request: Request, current_user: User = Depends(get_current_user)):
     """
     Get current authenticated user information
     """
+    await check_rate_limit(request, "auth_me")
     try:
-        return UserResponse(
+        return UserResponse.model_construct(
             id=str(current_user.id),
             email=current_user.email,
             username=current_user.username,
@@ -127,7 +138,7 @@ async def get_current_user_info(request: Request, current_user: User = Depends(g
         raise
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=_HTTP_500,
             detail=str(e)
         )
 
@@ -2,60 +2,173 @@
 Gene Analysis Router - Handles gene editing analysis requests
 Flow: Frontend -> Server -> Microservice -> Server -> Frontend
 """
+import asyncio
 import httpx
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from datetime import datetime
+import orjson
+import re
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response
+from fastapi.responses import ORJSONResponse
+from datetime import datetime, timedelta
 from bson import ObjectId
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from schemas.gene_analysis import (
     GeneAnalysisRequest,
     GeneAnalysisResponse,
     AnalysisHistoryResponse,
     AnalysisHistoryItem,
+    AnalysisJobResponse,
+    AnalysisPinResponse,
+    AnalysisStatus,
     EditSummaryResponse
 )
 from core.dependencies import get_current_user
-from core.database import get_db
 from core.config import settings
-from core.rate_limit import limiter, get_rate_limit
+from core.database import get_db, GENE_ANALYSES_HISTORY_INDEX, ANALYSIS_WRITE_CONCERN
+from core.http_clients import get_microservice_client, get_ollama_client, microservice_breaker
+from core.rate_limit import check_rate_limit
 from model.user import User
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from services.ollama import generate_edit_summary
+from services.analysis_cache import generate_analysis_cache_key, get_cached_analysis, cache_analysis
+from services.sequence_store import SEQUENCE_PREVIEW_LENGTH, store_sequence, load_sequence
+from services.analysis_writer import queue_analysis
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/gene-analysis", tags=["Gene Analysis"])
 
 
-async def call_microservice(request_data: dict) -> dict:
+ANALYSIS_RETENTION = timedelta(seconds=settings.ANALYSIS_RETENTION_SECS)
+
+# Queued jobs run in-process, so a worker restart drops them; a job still
+# pending after this long (well past the microservice timeout and retries)
+# is reported as failed
+ANALYSIS_JOB_STALE_AFTER = timedelta(minutes=30)
+
+_OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def parse_analysis_id(analysis_id: str) -> ObjectId:
     """
-    Call the gene edit microservice
+    Dependency converting the analysis_id path parameter to an ObjectId,
+    rejecting malformed IDs with a 400
     """
-    try:
-        microservice_url = f"{settings.GENE_EDIT_SERVICE_URL}/api/v1/gene-edit/suggest"
-        
-        async with httpx.AsyncClient(timeout=300.0) as client:  # 5 minute timeout for ML processing
-            response = await client.post(
-                microservice_url,
-                json=request_data,
-                headers={"Content-Type": "application/json"}
-            )
+    if not _OBJECT_ID_RE.fullmatch(analysis_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid analysis ID format"
+        )
+    return ObjectId(analysis_id)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header lists the given ETag
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or any(
+        tag.strip().removeprefix("W/") == etag for tag in header.split(",")
+    )
+
+
+# A result larger than MongoDB's document limit could not be stored anyway
+MAX_MICROSERVICE_RESPONSE_BYTES = 16 * 1024 * 1024
+
+
+def raise_result_too_large():
+    logger.error("Microservice response exceeded the size limit")
+    raise HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail="Analysis result is too large to store"
+    )
+
+
+# Gateway errors and dropped connections are retried; timeouts are not, since
+# each attempt may already have waited the full ML processing timeout
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+def is_retryable_microservice_error(exc: BaseException) -> bool:
+    if isinstance(exc, (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in RETRYABLE_STATUS_CODES
+
+
+@retry(
+    retry=retry_if_exception(is_retryable_microservice_error),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    stop=stop_after_attempt(3),
+    reraise=True
+)
+async def post_analysis(client: httpx.AsyncClient, request_data: dict) -> dict:
+    """
+    POST a payload to the microservice. The body is streamed into a single
+    buffer and abandoned once it exceeds MAX_MICROSERVICE_RESPONSE_BYTES.
+    """
+    async with client.stream(
+        "POST",
+        "/api/v1/gene-edit/suggest",
+        content=orjson.dumps(request_data),
+        headers={"Content-Type": "application/json"}
+    ) as response:
+        if response.is_error:
+            await response.aread()
             response.raise_for_status()
-            return response.json()
+        
+        content_length = int(response.headers.get("content-length") or 0)
+        if content_length > MAX_MICROSERVICE_RESPONSE_BYTES:
+            raise_result_too_large()
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > MAX_MICROSERVICE_RESPONSE_BYTES:
+                raise_result_too_large()
+    return orjson.loads(body)
+
+
+async def call_microservice(client: httpx.AsyncClient, request_data: dict) -> dict:
+    """
+    Call the gene edit microservice using the shared keep-alive client, with
+    retries on transient failures and a circuit breaker that fails fast while
+    the service is down
+    """
+    if not microservice_breaker.allow_request():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis service is temporarily unavailable. Please try again shortly."
+        )
+    try:
+        result = await post_analysis(client, request_data)
+        microservice_breaker.record_success()
+        return result
+    except HTTPException:
+        # The service answered (with an oversized result), so it is up
+        microservice_breaker.record_success()
+        raise
     except httpx.TimeoutException:
+        microservice_breaker.record_failure()
         logger.error("Microservice request timed out")
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="Analysis request timed out. Please try again with a shorter sequence."
         )
     except httpx.HTTPStatusError as e:
+        if e.response.status_code >= 500:
+            microservice_breaker.record_failure()
+        else:
+            microservice_breaker.record_success()
         logger.error(f"Microservice returned error: {e.response.status_code} - {e.response.text}")
         raise HTTPException(
             status_code=e.response.status_code,
             detail=f"Microservice error: {e.response.text}"
         )
     except Exception as e:
+        microservice_breaker.record_failure()
         logger.error(f"Error calling microservice: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -63,77 +176,225 @@ async def call_microservice(request_data: dict) -> dict:
         )
 
 
+async def fetch_analysis(client: httpx.AsyncClient, db: AsyncIOMotorDatabase, request_data: dict) -> dict:
+    """
+    Return the microservice response for a payload, reusing a cached result for identical inputs
+    """
+    cache_key = generate_analysis_cache_key(request_data)
+    cached = await get_cached_analysis(db, cache_key)
+    if cached is not None:
+        return cached
+    
+    microservice_response = await call_microservice(client, request_data)
+    await cache_analysis(db, cache_key, microservice_response)
+    return microservice_response
+
+
+def build_microservice_request(analysis_request: GeneAnalysisRequest) -> dict:
+    """
+    Convert an analysis request to the microservice payload.
+    The request fields map one-to-one, with enums already dumped as their values.
+    """
+    return analysis_request.model_dump(mode="json")
+
+
+def build_analysis_response(
+    analysis_id: str,
+    analysis_request: GeneAnalysisRequest,
+    microservice_response: dict
+) -> GeneAnalysisResponse:
+    """
+    Validate a microservice result once into the response model
+    """
+    return GeneAnalysisResponse(
+        analysis_id=analysis_id,
+        request_id=microservice_response.get("request_id", analysis_id),
+        dna_sequence=analysis_request.dna_sequence,
+        edit_suggestions=microservice_response.get("edit_suggestions", []),
+        dnabert_validations=microservice_response.get("dnabert_validations", []),
+        snp_changes=microservice_response.get("snp_changes", []),
+        summary=microservice_response.get("summary", {}),
+        metrics=microservice_response.get("metrics", {}),
+        created_at=datetime.utcnow()
+    )
+
+
+def build_analysis_doc(
+    analysis_id: ObjectId,
+    user_id: ObjectId,
+    microservice_request: dict,
+    analysis_response: GeneAnalysisResponse,
+    dna_sequence_ref: str
+) -> dict:
+    """
+    Build the MongoDB document for a completed analysis from the microservice
+    payload and the response model.
+    The sequence itself lives in gene_sequences; only a preview is kept inline.
+    """
+    analysis_doc = analysis_response.model_dump(exclude={"analysis_id", "dna_sequence"})
+    analysis_doc.update(microservice_request)
+    del analysis_doc["dna_sequence"]
+    analysis_doc.update({
+        "_id": analysis_id,
+        "user_id": user_id,
+        "dna_sequence_ref": dna_sequence_ref,
+        "dna_sequence_preview": microservice_request["dna_sequence"][:SEQUENCE_PREVIEW_LENGTH],
+        "updated_at": analysis_response.created_at,
+        # Purged by the TTL index unless the user pins it
+        "expires_at": analysis_response.created_at + ANALYSIS_RETENTION
+    })
+    return analysis_doc
+
+
+# Only what AnalysisHistoryItem needs; the sequence is cut to one character past
+# the display length so truncation can still be detected. Older documents store
+# the full sequence inline instead of a preview.
+HISTORY_PROJECTION = {
+    "_id": 1,
+    "dna_sequence": {"$ifNull": [
+        "$dna_sequence_preview",
+        {"$substrBytes": ["$dna_sequence", 0, SEQUENCE_PREVIEW_LENGTH]}
+    ]},
+    "target_trait": 1,
+    "dataset_name": 1,
+    "created_at": 1,
+    "summary": 1,
+}
+
+
+# Fields GeneAnalysisResponse is rebuilt from; load_sequence resolves the sequence
+DETAIL_PROJECTION = {
+    "request_id": 1,
+    "dna_sequence": 1,
+    "dna_sequence_ref": 1,
+    "dna_sequence_preview": 1,
+    "edit_suggestions": 1,
+    "dnabert_validations": 1,
+    "snp_changes": 1,
+    "summary": 1,
+    "metrics": 1,
+    "created_at": 1,
+}
+
+# Only what the summary prompt reads, plus a previously generated summary
+SUMMARY_PROJECTION = {
+    "request_id": 1,
+    "edit_suggestions": 1,
+    "snp_changes": 1,
+    "summary": 1,
+    "target_trait": 1,
+    "created_at": 1,
+    "ai_summary": 1,
+}
+
+# Generated summaries by (user_id, analysis_id); the persisted ai_summary field
+# backs this across workers and restarts
+_summary_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+
+
+async def save_analysis(db: AsyncIOMotorDatabase, analysis_doc: dict):
+    """
+    Insert an analysis and bump the owner's cached analysis count.
+    The count is only incremented once user_stats has been seeded by get_analysis_count.
+    """
+    await db.gene_analyses.with_options(write_concern=ANALYSIS_WRITE_CONCERN).insert_one(analysis_doc)
+    await db.user_stats.update_one(
+        {"_id": analysis_doc["user_id"]},
+        {"$inc": {"analysis_count": 1}}
+    )
+
+
+async def get_analysis_count(db: AsyncIOMotorDatabase, user_id: ObjectId) -> int:
+    """
+    Read a user's analysis count from user_stats, seeding it with an exact
+    count the first time. Seeds expire daily so analyses purged by the
+    retention TTL are reflected.
+    """
+    stats = await db.user_stats.find_one({"_id": user_id}, projection={"analysis_count": 1})
+    if stats is not None:
+        return stats["analysis_count"]
+    
+    total = await db.gene_analyses.count_documents({"user_id": user_id}, hint=GENE_ANALYSES_HISTORY_INDEX)
+    await db.user_stats.update_one(
+        {"_id": user_id},
+        {"$setOnInsert": {"analysis_count": total, "seeded_at": datetime.utcnow()}},
+        upsert=True
+    )
+    return total
+
+
+async def run_analysis_job(
+    client: httpx.AsyncClient,
+    db: AsyncIOMotorDatabase,
+    analysis_id: ObjectId,
+    user_id: ObjectId,
+    analysis_request: GeneAnalysisRequest
+):
+    """
+    Background job: call the microservice, save the analysis and record the job outcome
+    """
+    try:
+        microservice_request = build_microservice_request(analysis_request)
+        microservice_response = await fetch_analysis(client, db, microservice_request)
+        analysis_response = build_analysis_response(str(analysis_id), analysis_request, microservice_response)
+        sequence_ref = await store_sequence(db, analysis_request.dna_sequence)
+        analysis_doc = build_analysis_doc(analysis_id, user_id, microservice_request, analysis_response, sequence_ref)
+        # Batched with other finished jobs when the writer is running
+        pending_write = queue_analysis(analysis_doc)
+        if pending_write is None:
+            await save_analysis(db, analysis_doc)
+        else:
+            await pending_write
+        update = {"status": AnalysisStatus.DONE.value}
+        logger.info(f"Saved queued analysis {analysis_id} for user {user_id}")
+    except HTTPException as e:
+        update = {"status": AnalysisStatus.FAILED.value, "error": str(e.detail)}
+    except Exception as e:
+        logger.error(f"Error in queued analysis {analysis_id}: {str(e)}")
+        update = {"status": AnalysisStatus.FAILED.value, "error": f"Error processing analysis: {str(e)}"}
+    
+    update["updated_at"] = datetime.utcnow()
+    await db.gene_analysis_jobs.update_one({"_id": analysis_id}, {"$set": update})
+
+
 @router.post("/analyze", response_model=GeneAnalysisResponse, status_code=status.HTTP_200_OK)
-@limiter.limit(get_rate_limit("gene_analysis"))
 async def analyze_gene_edits(
     request: Request,
     analysis_request: GeneAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_microservice_client)
 ):
     """
     Analyze gene edits - forwards request to microservice and saves result to MongoDB
     Flow: Frontend -> Server -> Microservice -> Server (save to DB) -> Frontend
     """
+    await check_rate_limit(request, "gene_analysis")
     try:
         # Convert request to microservice format
-        microservice_request = {
-            "dna_sequence": analysis_request.dna_sequence,
-            "target_trait": analysis_request.target_trait.value,
-            "target_region": analysis_request.target_region,
-            "max_suggestions": analysis_request.max_suggestions,
-            "min_efficiency": analysis_request.min_efficiency,
-            "dataset_name": analysis_request.dataset_name,
-            "dataset_category": analysis_request.dataset_category
-        }
+        microservice_request = build_microservice_request(analysis_request)
         
         logger.info(f"Forwarding analysis request to microservice for user {current_user.id}")
         
-        # Call microservice
-        microservice_response = await call_microservice(microservice_request)
+        # Call microservice (or reuse a cached result for identical inputs)
+        microservice_response = await fetch_analysis(client, db, microservice_request)
         
         # Generate analysis ID
         analysis_id = str(ObjectId())
         
-        # Prepare analysis document for MongoDB
-        analysis_doc = {
-            "_id": ObjectId(analysis_id),
-            "user_id": current_user.id,
-            "request_id": microservice_response.get("request_id", analysis_id),
-            "dna_sequence": analysis_request.dna_sequence,
-            "target_trait": analysis_request.target_trait.value,
-            "target_region": analysis_request.target_region,
-            "max_suggestions": analysis_request.max_suggestions,
-            "min_efficiency": analysis_request.min_efficiency,
-            "dataset_name": analysis_request.dataset_name,
-            "dataset_category": analysis_request.dataset_category,
-            "edit_suggestions": microservice_response.get("edit_suggestions", []),
-            "dnabert_validations": microservice_response.get("dnabert_validations", []),
-            "snp_changes": microservice_response.get("snp_changes", []),
-            "summary": microservice_response.get("summary", {}),
-            "metrics": microservice_response.get("metrics", {}),
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+        # Validate the result once; the stored document is derived from the response
+        analysis_response = build_analysis_response(analysis_id, analysis_request, microservice_response)
+        sequence_ref = await store_sequence(db, analysis_request.dna_sequence)
+        analysis_doc = build_analysis_doc(
+            ObjectId(analysis_id), current_user.id, microservice_request, analysis_response, sequence_ref
+        )
         
         # Save to MongoDB
-        await db.gene_analyses.insert_one(analysis_doc)
+        await save_analysis(db, analysis_doc)
         logger.info(f"Saved analysis {analysis_id} to database for user {current_user.id}")
         
-        # Prepare response
-        response_data = {
-            "analysis_id": analysis_id,
-            "request_id": microservice_response.get("request_id", analysis_id),
-            "dna_sequence": analysis_request.dna_sequence,
-            "edit_suggestions": microservice_response.get("edit_suggestions", []),
-            "dnabert_validations": microservice_response.get("dnabert_validations", []),
-            "snp_changes": microservice_response.get("snp_changes", []),
-            "summary": microservice_response.get("summary", {}),
-            "metrics": microservice_response.get("metrics", {}),
-            "created_at": analysis_doc["created_at"]
-        }
-        
-        return GeneAnalysisResponse(**response_data)
+        # Already validated above; returning a Response skips FastAPI's second pass
+        return ORJSONResponse(analysis_response.model_dump(mode="json"))
         
     except HTTPException:
         raise
@@ -145,46 +406,131 @@ async def analyze_gene_edits(
         )
 
 
+@router.post("/analyze/async", response_model=AnalysisJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def queue_gene_analysis(
+    request: Request,
+    analysis_request: GeneAnalysisRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    client: httpx.AsyncClient = Depends(get_microservice_client)
+):
+    """
+    Queue a gene analysis and return immediately with its ID.
+    Poll /analyze/{analysis_id}/status; once done the analysis is available under /history.
+    """
+    await check_rate_limit(request, "gene_analysis")
+    analysis_id = ObjectId()
+    now = datetime.utcnow()
+    await db.gene_analysis_jobs.insert_one({
+        "_id": analysis_id,
+        "user_id": current_user.id,
+        "status": AnalysisStatus.PENDING.value,
+        "created_at": now,
+        "updated_at": now
+    })
+    background_tasks.add_task(
+        run_analysis_job, client, db, analysis_id, current_user.id, analysis_request
+    )
+    logger.info(f"Queued analysis {analysis_id} for user {current_user.id}")
+    
+    return AnalysisJobResponse(analysis_id=str(analysis_id), status=AnalysisStatus.PENDING)
+
+
+@router.get("/analyze/{analysis_id}/status", response_model=AnalysisJobResponse)
+async def get_analysis_status(
+    request: Request,
+    analysis_id: str,
+    current_user: User = Depends(get_current_user),
+    obj_id: ObjectId = Depends(parse_analysis_id),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Get the status of a queued analysis
+    """
+    await check_rate_limit(request, "gene_analysis_detail")
+    job = await db.gene_analysis_jobs.find_one(
+        {"_id": obj_id, "user_id": current_user.id},
+        projection={"status": 1, "error": 1, "updated_at": 1}
+    )
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    
+    if job["status"] == AnalysisStatus.PENDING.value and job["updated_at"] < datetime.utcnow() - ANALYSIS_JOB_STALE_AFTER:
+        job["status"] = AnalysisStatus.FAILED.value
+        job["error"] = "Analysis was interrupted. Please submit it again."
+        await db.gene_analysis_jobs.update_one(
+            {"_id": obj_id, "status": AnalysisStatus.PENDING.value},
+            {"$set": {"status": job["status"], "error": job["error"], "updated_at": datetime.utcnow()}}
+        )
+    
+    return AnalysisJobResponse(
+        analysis_id=analysis_id,
+        status=job["status"],
+        error=job.get("error")
+    )
+
+
 @router.get("/history", response_model=AnalysisHistoryResponse)
-@limiter.limit(get_rate_limit("gene_analysis_history"))
 async def get_analysis_history(
     request: Request,
     limit: int = 20,
     skip: int = 0,
+    with_total: bool = True,
     current_user: User = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
-    Get analysis history for the current user
+    Get analysis history for the current user.
+    has_more says whether another page exists; pass with_total=false to skip the total count.
     """
+    await check_rate_limit(request, "gene_analysis_history")
     try:
-        # Query analyses for current user, sorted by created_at descending
+        # Page of analyses for current user (newest first), fetching one extra
+        # document to detect a next page; the total comes from the user_stats
+        # counter and is fetched concurrently
+        fetch_limit = limit + 1 if limit > 0 else 0
         cursor = db.gene_analyses.find(
-            {"user_id": current_user.id}
-        ).sort("created_at", -1).skip(skip).limit(limit)
+            {"user_id": current_user.id}, projection=HISTORY_PROJECTION
+        ).hint(GENE_ANALYSES_HISTORY_INDEX).sort("created_at", -1).skip(skip).limit(fetch_limit)
         
-        analyses_list = await cursor.to_list(length=limit)
+        if with_total:
+            analyses_list, total = await asyncio.gather(
+                cursor.to_list(length=fetch_limit or None),
+                get_analysis_count(db, current_user.id)
+            )
+        else:
+            analyses_list, total = await cursor.to_list(length=fetch_limit or None), None
         
-        # Get total count
-        total = await db.gene_analyses.count_documents({"user_id": current_user.id})
+        has_more = limit > 0 and len(analyses_list) > limit
+        if has_more:
+            analyses_list = analyses_list[:limit]
         
         # Format response
         history_items = []
+        # Fallback for documents without created_at, taken once rather than per row
+        now = datetime.utcnow()
         for analysis in analyses_list:
+            # The projection already caps the sequence at SEQUENCE_PREVIEW_LENGTH
+            sequence = analysis.get("dna_sequence", "")
             history_items.append(
                 AnalysisHistoryItem(
                     analysis_id=str(analysis["_id"]),
-                    dna_sequence=analysis.get("dna_sequence", "")[:100] + "..." if len(analysis.get("dna_sequence", "")) > 100 else analysis.get("dna_sequence", ""),
+                    dna_sequence=sequence[:100] + "..." if len(sequence) > 100 else sequence,
                     target_trait=analysis.get("target_trait", ""),
                     dataset_name=analysis.get("dataset_name", "maize"),  # Default to maize if not set
-                    created_at=analysis.get("created_at", datetime.utcnow()),
+                    created_at=analysis.get("created_at", now),
                     summary=analysis.get("summary", {})
                 )
             )
         
         return AnalysisHistoryResponse(
             analyses=history_items,
-            total=total
+            total=total,
+            has_more=has_more
         )
         
     except Exception as e:
@@ -196,31 +542,38 @@ async def get_analysis_history(
 
 
 @router.get("/history/{analysis_id}", response_model=GeneAnalysisResponse)
-@limiter.limit(get_rate_limit("gene_analysis_detail"))
 async def get_analysis_detail(
     request: Request,
+    response: Response,
     analysis_id: str,
     current_user: User = Depends(get_current_user),
+    obj_id: ObjectId = Depends(parse_analysis_id),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
-    Get detailed analysis by ID
+    Get detailed analysis by ID.
+    Analysis results never change once stored, so the ID doubles as the ETag;
+    a matching If-None-Match only checks ownership and returns 304.
     """
+    await check_rate_limit(request, "gene_analysis_detail")
+    etag = f'"{obj_id}"'
     try:
-        # Validate ObjectId
-        try:
-            obj_id = ObjectId(analysis_id)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid analysis ID format"
+        if etag_matches(request, etag):
+            owned = await db.gene_analyses.find_one(
+                {"_id": obj_id, "user_id": current_user.id},
+                projection={"_id": 1}
             )
+            if owned is not None:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+                )
         
         # Find analysis
         analysis = await db.gene_analyses.find_one({
             "_id": obj_id,
             "user_id": current_user.id
-        })
+        }, projection=DETAIL_PROJECTION)
         
         if not analysis:
             raise HTTPException(
@@ -228,18 +581,21 @@ async def get_analysis_detail(
                 detail="Analysis not found"
             )
         
-        # Format response
-        return GeneAnalysisResponse(
-            analysis_id=str(analysis["_id"]),
-            request_id=analysis.get("request_id", str(analysis["_id"])),
-            dna_sequence=analysis.get("dna_sequence", ""),
-            edit_suggestions=analysis.get("edit_suggestions", []),
-            dnabert_validations=analysis.get("dnabert_validations", []),
-            snp_changes=analysis.get("snp_changes", []),
-            summary=analysis.get("summary", {}),
-            metrics=analysis.get("metrics", {}),
-            created_at=analysis.get("created_at", datetime.utcnow())
-        )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        
+        # Format response; FastAPI validates it once against response_model
+        return {
+            "analysis_id": str(analysis["_id"]),
+            "request_id": analysis.get("request_id", str(analysis["_id"])),
+            "dna_sequence": await load_sequence(db, analysis),
+            "edit_suggestions": analysis.get("edit_suggestions", []),
+            "dnabert_validations": analysis.get("dnabert_validations", []),
+            "snp_changes": analysis.get("snp_changes", []),
+            "summary": analysis.get("summary", {}),
+            "metrics": analysis.get("metrics", {}),
+            "created_at": analysis.get("created_at", datetime.utcnow())
+        }
         
     except HTTPException:
         raise
@@ -251,33 +607,85 @@ async def get_analysis_detail(
         )
 
 
+@router.post("/history/{analysis_id}/pin", response_model=AnalysisPinResponse)
+async def pin_analysis(
+    request: Request,
+    analysis_id: str,
+    current_user: User = Depends(get_current_user),
+    obj_id: ObjectId = Depends(parse_analysis_id),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Pin an analysis so it is kept past the retention period
+    """
+    await check_rate_limit(request, "gene_analysis_detail")
+    result = await db.gene_analyses.update_one(
+        {"_id": obj_id, "user_id": current_user.id},
+        {"$set": {"pinned": True, "updated_at": datetime.utcnow()}, "$unset": {"expires_at": ""}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    return AnalysisPinResponse(analysis_id=analysis_id, pinned=True)
+
+
+@router.delete("/history/{analysis_id}/pin", response_model=AnalysisPinResponse)
+async def unpin_analysis(
+    request: Request,
+    analysis_id: str,
+    current_user: User = Depends(get_current_user),
+    obj_id: ObjectId = Depends(parse_analysis_id),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Unpin an analysis; it expires once the retention period since creation has passed
+    """
+    await check_rate_limit(request, "gene_analysis_detail")
+    analysis = await db.gene_analyses.find_one_and_update(
+        {"_id": obj_id, "user_id": current_user.id},
+        [{"$set": {
+            "pinned": False,
+            "updated_at": "$$NOW",
+            "expires_at": {"$add": ["$created_at", settings.ANALYSIS_RETENTION_SECS * 1000]}
+        }}],
+        projection={"_id": 1}
+    )
+    if analysis is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+    return AnalysisPinResponse(analysis_id=analysis_id, pinned=False)
+
+
 @router.post("/history/{analysis_id}/summary", response_model=EditSummaryResponse)
-@limiter.limit(get_rate_limit("gene_analysis_detail"))
 async def generate_summary(
     request: Request,
     analysis_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncIOMotorDatabase = Depends(get_db)
+    obj_id: ObjectId = Depends(parse_analysis_id),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    ollama_client: httpx.AsyncClient = Depends(get_ollama_client)
 ):
     """
     Generate a comprehensive summary explaining the gene edit suggestions and their effects.
     Uses Ollama (llama3.2) to generate human-readable explanations.
+    Generated summaries are stored on the analysis and reused on later calls.
     """
+    await check_rate_limit(request, "gene_analysis_detail")
+    cache_key = (current_user.id, obj_id)
+    cached_summary = _summary_cache.get(cache_key)
+    if cached_summary is not None:
+        return EditSummaryResponse(analysis_id=analysis_id, summary=cached_summary)
+    
     try:
-        # Validate ObjectId
-        try:
-            obj_id = ObjectId(analysis_id)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid analysis ID format"
-            )
-        
         # Find analysis
         analysis = await db.gene_analyses.find_one({
             "_id": obj_id,
             "user_id": current_user.id
-        })
+        }, projection=SUMMARY_PROJECTION)
         
         if not analysis:
             raise HTTPException(
@@ -285,16 +693,19 @@ async def generate_summary(
                 detail="Analysis not found"
             )
         
-        # Convert to GeneAnalysisResponse
+        if analysis.get("ai_summary"):
+            _summary_cache[cache_key] = analysis["ai_summary"]
+            return EditSummaryResponse(analysis_id=analysis_id, summary=analysis["ai_summary"])
+        
+        # Convert to GeneAnalysisResponse; the prompt does not use the sequence,
+        # validations or metrics, so they are neither fetched nor loaded
         analysis_response = GeneAnalysisResponse(
             analysis_id=str(analysis["_id"]),
             request_id=analysis.get("request_id", str(analysis["_id"])),
-            dna_sequence=analysis.get("dna_sequence", ""),
             edit_suggestions=analysis.get("edit_suggestions", []),
-            dnabert_validations=analysis.get("dnabert_validations", []),
+            dnabert_validations=[],
             snp_changes=analysis.get("snp_changes", []),
             summary=analysis.get("summary", {}),
-            metrics=analysis.get("metrics", {}),
             created_at=analysis.get("created_at", datetime.utcnow())
         )
         
@@ -303,7 +714,15 @@ async def generate_summary(
         
         # Generate summary using Ollama
         logger.info(f"Generating summary for analysis {analysis_id} using Ollama")
-        summary_text = await generate_edit_summary(analysis_response, target_trait)
+        summary_text, generated = await generate_edit_summary(analysis_response, target_trait, ollama_client)
+        
+        # Fallback summaries are not stored so a later call can retry Ollama
+        if generated:
+            await db.gene_analyses.update_one(
+                {"_id": obj_id},
+                {"$set": {"ai_summary": summary_text, "ai_summary_at": datetime.utcnow()}}
+            )
+            _summary_cache[cache_key] = summary_text
         
         return EditSummaryResponse(
             analysis_id=analysis_id,
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from schemas.llm import LLMQueryRequest, LLMQueryResponse
 from services.gemini import generate_response
+from services.cache import generate_cache_key, parse_cached_response, get_local_response, remember_response
 from core.dependencies import get_current_user
 from core.database import get_db
-from core.rate_limit import limiter, get_rate_limit
+from core.rate_limit import rate_limited_pipeline, check_rate_limit
 from model.user import User
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from bson import ObjectId
 from datetime import datetime
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,11 +16,40 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/llm", tags=["LLM"])
 
 
+async def _rate_limit_and_lookup(request: Request, cache_key: str) -> Optional[LLMQueryResponse]:
+    """
+    Count the rate-limit hit and read the response cache in one Redis round-trip.
+    Returns the cached response, if any.
+    """
+    replies = await rate_limited_pipeline(request, "llm_query", lambda pipe: pipe.get(cache_key))
+    if not replies:
+        return None
+    try:
+        response = parse_cached_response(replies[0])
+        if response is not None:
+            remember_response(cache_key, response)
+        return response
+    except Exception as e:
+        logger.warning(f"Error reading cached response: {str(e)}")
+        return None
+
+
+async def save_llm_query(db: AsyncIOMotorDatabase, llm_query_dict: dict) -> None:
+    """
+    Record an answered query; runs after the response is sent, so failures are only logged
+    """
+    try:
+        await db.llm_queries.insert_one(llm_query_dict)
+        logger.info(f"Saved LLM query to database for user: {llm_query_dict['user_id']}")
+    except Exception as e:
+        logger.error(f"Error saving LLM query: {str(e)}")
+
+
 @router.post("/query", response_model=LLMQueryResponse, status_code=status.HTTP_200_OK)
-@limiter.limit(get_rate_limit("llm_query"))
 async def query_llm(
     request: Request,
     query_request: LLMQueryRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
@@ -30,11 +60,23 @@ async def query_llm(
                 detail="Question cannot be empty"
             )
         
-        # Generate response
-        response = await generate_response(query_request)
+        # Rate limit and cache lookup share one round-trip; generate only on a miss.
+        # The key is hashed once and reused when caching the generated response
+        cache_key = generate_cache_key(query_request)
+        response = get_local_response(cache_key)
+        if response is not None:
+            # Served from this process; only the rate limit needs Redis
+            await check_rate_limit(request, "llm_query")
+        else:
+            response = await _rate_limit_and_lookup(request, cache_key)
+        if response is not None:
+            logger.info("Returning cached LLM response")
+        else:
+            response = await generate_response(query_request, check_cache=False, cache_key=cache_key)
         
-        # Save to database after generation
-        user_id = current_user.id if isinstance(current_user.id, ObjectId) else ObjectId(current_user.id)
+        # Save to database once the response has been sent
+        # get_current_user always yields an ObjectId id (User.id is a PyObjectId)
+        user_id = current_user.id
         llm_query_dict = {
             "user_id": user_id,
             "question": response.question,
@@ -45,8 +87,7 @@ async def query_llm(
             "created_at": datetime.utcnow()
         }
         
-        await db.llm_queries.insert_one(llm_query_dict)
-        logger.info(f"Saved LLM query to database for user: {user_id}")
+        background_tasks.add_task(save_llm_query, db, llm_query_dict)
         
         return response
     
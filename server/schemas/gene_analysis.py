@@ -96,7 +96,14 @@ class AnalysisHistoryItem(BaseModel):
 class AnalysisHistoryResponse(BaseModel):
     """Response model for analysis history"""
     analyses: List[AnalysisHistoryItem]
-    total: int
+    total: Optional[int] = None
+    has_more: bool = False
+
+
+class AnalysisPinResponse(BaseModel):
+    """Response model for pinning or unpinning an analysis"""
+    analysis_id: str
+    pinned: bool
 
 
 class EditSummaryResponse(BaseModel):
@@ -104,3 +111,16 @@ class EditSummaryResponse(BaseModel):
     analysis_id: str
     summary: str
 
+
+class AnalysisStatus(str, Enum):
+    """Lifecycle of a queued gene analysis"""
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class AnalysisJobResponse(BaseModel):
+    """Response model for a queued gene analysis"""
+    analysis_id: str
+    status: AnalysisStatus
+    error: Optional[str] = None
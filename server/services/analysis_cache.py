@@ -0,0 +1,85 @@
+import hashlib
+import orjson
+from datetime import datetime
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from core.redis import get_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_KEY_PREFIX = "gene:analysis:"
+# Redis holds hot entries; MongoDB keeps them for a day via a TTL index
+ANALYSIS_REDIS_TTL = 3600
+ANALYSIS_MONGO_TTL = 86400
+
+
+def generate_analysis_cache_key(microservice_request: dict) -> str:
+    """
+    Generate a cache key from the microservice payload.
+    Identical inputs (sequence, trait, region, limits, dataset) share a key.
+    """
+    cache_bytes = orjson.dumps(microservice_request, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(cache_bytes).hexdigest()
+
+
+async def get_cached_analysis(db: AsyncIOMotorDatabase, cache_key: str) -> Optional[dict]:
+    """
+    Retrieve a cached microservice response, checking Redis before MongoDB.
+    Returns None if not found or on error.
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            cached_data = await redis.get(f"{ANALYSIS_CACHE_KEY_PREFIX}{cache_key}")
+            if cached_data:
+                logger.info(f"Analysis cache hit (Redis) for key: {cache_key[:16]}...")
+                return orjson.loads(cached_data)
+        except Exception as e:
+            logger.warning(f"Error reading analysis cache from Redis: {str(e)}")
+    
+    try:
+        cached = await db.gene_analysis_cache.find_one({"_id": cache_key}, projection={"response": 1})
+    except Exception as e:
+        logger.warning(f"Error reading analysis cache from MongoDB: {str(e)}")
+        return None
+    if cached is None:
+        return None
+    
+    logger.info(f"Analysis cache hit (MongoDB) for key: {cache_key[:16]}...")
+    if redis is not None:
+        try:
+            await redis.setex(
+                f"{ANALYSIS_CACHE_KEY_PREFIX}{cache_key}",
+                ANALYSIS_REDIS_TTL,
+                orjson.dumps(cached["response"])
+            )
+        except Exception as e:
+            logger.warning(f"Error backfilling analysis cache: {str(e)}")
+    return cached["response"]
+
+
+async def cache_analysis(db: AsyncIOMotorDatabase, cache_key: str, response: dict) -> None:
+    """
+    Cache a microservice response in Redis and MongoDB.
+    Silently fails if caching is unavailable.
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.setex(
+                f"{ANALYSIS_CACHE_KEY_PREFIX}{cache_key}",
+                ANALYSIS_REDIS_TTL,
+                orjson.dumps(response)
+            )
+        except Exception as e:
+            logger.warning(f"Error caching analysis in Redis: {str(e)}")
+    
+    try:
+        await db.gene_analysis_cache.replace_one(
+            {"_id": cache_key},
+            {"response": response, "created_at": datetime.utcnow()},
+            upsert=True
+        )
+    except Exception as e:
+        logger.warning(f"Error caching analysis in MongoDB: {str(e)}")
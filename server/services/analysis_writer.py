@@ -0,0 +1,105 @@
+import asyncio
+from collections import Counter
+from typing import List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from core.database import ANALYSIS_WRITE_CONCERN
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Finished background analyses are coalesced into one insert_many per window
+# instead of one insert_one each. Documents carry their own _id, so the job
+# status can point at them as soon as the batch lands.
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_INTERVAL = 0.1
+
+_write_queue: Optional[asyncio.Queue] = None
+_writer_db: Optional[AsyncIOMotorDatabase] = None
+
+
+def queue_analysis(analysis_doc: dict) -> Optional[asyncio.Future]:
+    """
+    Queue an analysis document for the batch writer.
+    Returns a future resolved once the document is stored, or None if the writer is not running.
+    """
+    if _write_queue is None:
+        return None
+    future = asyncio.get_running_loop().create_future()
+    _write_queue.put_nowait((analysis_doc, future))
+    return future
+
+
+async def _flush_batch(db: AsyncIOMotorDatabase, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+    """Insert a batch of analyses and bump each owner's cached analysis count"""
+    docs = [doc for doc, _ in batch]
+    errors = {}
+    try:
+        await db.gene_analyses.with_options(write_concern=ANALYSIS_WRITE_CONCERN).insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # Unordered inserts keep going past failures; only the failed docs are reported
+        errors = {err["index"]: err.get("errmsg", "insert failed") for err in e.details.get("writeErrors", [])}
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+    
+    counts = Counter(doc["user_id"] for i, doc in enumerate(docs) if i not in errors)
+    if counts:
+        try:
+            # Like save_analysis, counts only move once user_stats has been seeded
+            await db.user_stats.bulk_write(
+                [UpdateOne({"_id": user_id}, {"$inc": {"analysis_count": n}}) for user_id, n in counts.items()],
+                ordered=False
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update analysis counts for batch: {e}")
+    
+    for i, (_, future) in enumerate(batch):
+        if future.done():
+            continue
+        if i in errors:
+            future.set_exception(RuntimeError(errors[i]))
+        else:
+            future.set_result(None)
+
+
+async def _run_writer(db: AsyncIOMotorDatabase, queue: asyncio.Queue) -> None:
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(WRITE_FLUSH_INTERVAL)
+        while len(batch) < WRITE_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await _flush_batch(db, batch)
+        except Exception as e:
+            logger.error(f"Unexpected error writing analysis batch: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def start_analysis_writer(db: AsyncIOMotorDatabase) -> asyncio.Task:
+    """Start the background task that batches analysis inserts"""
+    global _write_queue, _writer_db
+    _write_queue, _writer_db = asyncio.Queue(), db
+    return asyncio.create_task(_run_writer(db, _write_queue))
+
+
+async def stop_analysis_writer(task: asyncio.Task) -> None:
+    """Flush queued analyses and stop the writer; later saves go back to insert_one"""
+    global _write_queue
+    queue, _write_queue = _write_queue, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    
+    pending = []
+    while queue is not None and not queue.empty():
+        pending.append(queue.get_nowait())
+    if pending:
+        await _flush_batch(_writer_db, pending)
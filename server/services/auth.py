@@ -1,5 +1,6 @@
 from fastapi import HTTPException, status
 from core.database import get_database
+from core.dependencies import USER_PROJECTION
 from core.security import get_password_hash, verify_password, create_access_token
 from model.user import User
 from schemas.auth import UserCreate, UserLogin
@@ -7,33 +8,34 @@ from datetime import timedelta
 from core.config import settings
 from bson import ObjectId
 from bson.errors import InvalidId
+from typing import Optional
 
 
-async def get_user_by_email(email: str) -> User | None:
+async def get_user_by_email(email: str, projection: Optional[dict] = USER_PROJECTION) -> User | None:
     """
-    Get a user by email
+    Get a user by email, fetching only the projected fields (all fields if None)
     """
     database = get_database()
-    user = await database.users.find_one({"email": email})
+    user = await database.users.find_one({"email": email}, projection=projection)
     if user:
         return User(**user)
     return None
 
 
-async def get_user_by_username(username: str) -> User | None:
+async def get_user_by_username(username: str, projection: Optional[dict] = USER_PROJECTION) -> User | None:
     """
-    Get a user by username
+    Get a user by username, fetching only the projected fields (all fields if None)
     """
     database = get_database()
-    user = await database.users.find_one({"username": username})
+    user = await database.users.find_one({"username": username}, projection=projection)
     if user:
         return User(**user)
     return None
 
 
-async def get_user_by_id(user_id: str) -> User | None:
+async def get_user_by_id(user_id: str, projection: Optional[dict] = USER_PROJECTION) -> User | None:
     """
-    Get a user by ID
+    Get a user by ID, fetching only the projected fields (all fields if None)
     """
     try:
         object_id = ObjectId(user_id)
@@ -41,7 +43,7 @@ async def get_user_by_id(user_id: str) -> User | None:
         return None
     
     database = get_database()
-    user = await database.users.find_one({"_id": object_id})
+    user = await database.users.find_one({"_id": object_id}, projection=projection)
     if user:
         return User(**user)
     return None
@@ -1,5 +1,6 @@
 import hashlib
-import json
+import re
+from cachetools import TTLCache
 from typing import Optional
 from schemas.llm import LLMQueryRequest, LLMQueryResponse
 from core.redis import get_redis
@@ -10,48 +11,88 @@ logger = logging.getLogger(__name__)
 
 CACHE_KEY_PREFIX = "llm:query:"
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Keys are hashed with a server-side secret so they cannot be derived outside
+# the app; BLAKE2b accepts up to 64 key bytes
+_CACHE_KEY_SECRET = settings.SECRET_KEY.encode()[:64]
+
+# Responses served or generated by this process recently, checked before Redis
+_local_responses: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
 
 def generate_cache_key(request: LLMQueryRequest) -> str:
     """
     Generate a cache key from LLM query request.
     The key is based on question (normalized), difficulty, language, and allow_code_mixing.
     """
-    # Normalize question: lowercase and strip whitespace
-    normalized_question = request.question.lower().strip()
+    # Normalize question: strip, lowercase (casefold beyond ASCII) and collapse
+    # internal whitespace so trivially different spellings share a key
+    question = request.question.strip()
+    question = question.lower() if question.isascii() else question.casefold()
+    normalized_question = _WHITESPACE_RE.sub(" ", question)
     
-    # Create a dictionary with all relevant parameters
-    cache_data = {
-        "question": normalized_question,
-        "difficulty": request.difficulty.value,
-        "language": request.language.value,
-        "allow_code_mixing": request.allow_code_mixing
-    }
-    
-    # Create a JSON string and hash it for a consistent key
-    cache_string = json.dumps(cache_data, sort_keys=True)
-    cache_hash = hashlib.sha256(cache_string.encode()).hexdigest()
+    # Join the parameters with a separator that cannot appear in the enum values,
+    # then hash with the keyed BLAKE2b mode in the same single pass
+    cache_string = "\x00".join((
+        normalized_question,
+        request.difficulty.value,
+        request.language.value,
+        "1" if request.allow_code_mixing else "0"
+    ))
+    cache_hash = hashlib.blake2b(cache_string.encode(), key=_CACHE_KEY_SECRET, digest_size=16).hexdigest()
     
     return f"{CACHE_KEY_PREFIX}{cache_hash}"
 
 
-async def get_cached_response(request: LLMQueryRequest) -> Optional[LLMQueryResponse]:
+def parse_cached_response(cached_data: Optional[str]) -> Optional[LLMQueryResponse]:
+    """
+    Build an LLMQueryResponse from a raw cached value, or None if nothing was cached.
+    """
+    if not cached_data:
+        return None
+    return LLMQueryResponse.model_validate_json(cached_data)
+
+
+def get_local_response(cache_key: str) -> Optional[LLMQueryResponse]:
+    """
+    Return a response this process cached within the last minute, if any.
+    """
+    return _local_responses.get(cache_key)
+
+
+def remember_response(cache_key: str, response: LLMQueryResponse) -> None:
+    """
+    Keep a response in the in-process cache in front of Redis.
+    """
+    _local_responses[cache_key] = response
+
+
+async def get_cached_response(request: LLMQueryRequest, cache_key: Optional[str] = None) -> Optional[LLMQueryResponse]:
     """
     Retrieve cached LLM response if available.
+    Pass cache_key when it has already been generated for this request.
     Returns None if not found or on error.
     """
     try:
+        if cache_key is None:
+            cache_key = generate_cache_key(request)
+        
+        local_response = get_local_response(cache_key)
+        if local_response is not None:
+            return local_response
+        
         redis = get_redis()
         if redis is None:
             return None
-            
-        cache_key = generate_cache_key(request)
         
         cached_data = await redis.get(cache_key)
         
         if cached_data:
             logger.info(f"Cache hit for key: {cache_key[:50]}...")
-            response_dict = json.loads(cached_data)
-            return LLMQueryResponse(**response_dict)
+            response = parse_cached_response(cached_data)
+            remember_response(cache_key, response)
+            return response
         
         logger.debug(f"Cache miss for key: {cache_key[:50]}...")
         return None
@@ -65,21 +106,23 @@ async def get_cached_response(request: LLMQueryRequest) -> Optional[LLMQueryResp
         return None
 
 
-async def cache_response(request: LLMQueryRequest, response: LLMQueryResponse) -> None:
+async def cache_response(request: LLMQueryRequest, response: LLMQueryResponse, cache_key: Optional[str] = None) -> None:
     """
     Cache LLM response for future requests.
+    Pass cache_key when it has already been generated for this request.
     Silently fails if caching is unavailable.
     """
     try:
+        if cache_key is None:
+            cache_key = generate_cache_key(request)
+        remember_response(cache_key, response)
+        
         redis = get_redis()
         if redis is None:
             return
-            
-        cache_key = generate_cache_key(request)
         
-        # Convert response to dict and serialize
-        response_dict = response.model_dump()
-        cache_data = json.dumps(response_dict)
+        # Serialize straight to JSON; parse_cached_response validates it back in one pass
+        cache_data = response.model_dump_json()
         
         # Store with TTL
         await redis.setex(
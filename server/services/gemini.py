@@ -1,21 +1,27 @@
 import google.generativeai as genai
 from core.config import settings
 from schemas.llm import LLMQueryRequest, LLMQueryResponse, DifficultyLevel, Language
-from services.cache import get_cached_response, cache_response
+from services.cache import generate_cache_key, get_cached_response, cache_response
+from services.semantic_cache import embed_question, find_similar_response, add_response
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
-# Configure Gemini API
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
-# Initialize the model
 MODEL_NAME = "gemini-2.5-flash"
-model = genai.GenerativeModel(MODEL_NAME)
 
+# SDK versions without the async methods fall back to blocking calls, which get
+# their own pool so they neither starve nor are starved by other executor work
+GEMINI_EXECUTOR = ThreadPoolExecutor(max_workers=settings.GEMINI_CONCURRENCY, thread_name_prefix="gemini")
 
-def get_system_prompt(difficulty: DifficultyLevel, language: Language, allow_code_mixing: bool) -> str:
+# Generations in progress by cache key; concurrent identical misses await the first
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def _build_system_prompt(difficulty: DifficultyLevel, language: Language, allow_code_mixing: bool) -> str:
     """
     Generate system prompt based on difficulty level and language
     """
@@ -76,51 +82,133 @@ RESPONSE GUIDELINES:
     return base_prompt
 
 
-async def generate_response(request: LLMQueryRequest) -> LLMQueryResponse:
+# Every combination is built once at import; there are only 18
+_SYSTEM_PROMPTS = {
+    (difficulty, language, allow_code_mixing): _build_system_prompt(difficulty, language, allow_code_mixing)
+    for difficulty in DifficultyLevel
+    for language in Language
+    for allow_code_mixing in (True, False)
+}
+
+
+def get_system_prompt(difficulty: DifficultyLevel, language: Language, allow_code_mixing: bool) -> str:
+    """
+    Get the precomputed system prompt for a difficulty level, language and code-mixing setting
+    """
+    return _SYSTEM_PROMPTS[(difficulty, language, allow_code_mixing)]
+
+
+@lru_cache(maxsize=1)
+def configure_gemini() -> None:
+    """
+    Configure the Gemini API key on first use rather than at import
+    """
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+
+
+@lru_cache(maxsize=len(DifficultyLevel) * len(Language) * 2)
+def get_model(difficulty: DifficultyLevel, language: Language, allow_code_mixing: bool) -> genai.GenerativeModel:
+    """
+    Model with the system prompt for this combination set as its system
+    instruction. Requests then send only the question, and the identical
+    instruction prefix is eligible for Gemini's implicit context caching.
+    """
+    return genai.GenerativeModel(
+        MODEL_NAME,
+        system_instruction=get_system_prompt(difficulty, language, allow_code_mixing)
+    )
+
+
+async def _generate_uncached(request: LLMQueryRequest, cache_key: str) -> LLMQueryResponse:
+    """
+    Answer an exact-cache miss from the semantic cache or a new Gemini generation,
+    caching the result
+    """
+    configure_gemini()
+    
+    # Exact miss - look for an answer to a paraphrase of the question
+    question_vector = None
+    if settings.SEMANTIC_CACHE_ENABLED:
+        question_vector = await embed_question(request.question, GEMINI_EXECUTOR)
+        if question_vector is not None:
+            similar_response = find_similar_response(request, question_vector)
+            if similar_response is not None:
+                await cache_response(request, similar_response, cache_key)
+                return similar_response
+    
+    # Cache miss - generate new response
+    logger.info("Cache miss - generating new LLM response")
+    model = get_model(
+        request.difficulty,
+        request.language,
+        request.allow_code_mixing
+    )
+    
+    # The system prompt travels as the model's system instruction
+    full_prompt = f"Question: {request.question}\n\nAnswer:"
+    
+    # Generate response natively async; older SDKs run in the Gemini pool
+    if hasattr(model, "generate_content_async"):
+        response = await model.generate_content_async(full_prompt)
+    else:
+        response = await asyncio.get_running_loop().run_in_executor(
+            GEMINI_EXECUTOR,
+            model.generate_content,
+            full_prompt
+        )
+    
+    answer = response.text.strip()
+    
+    llm_response = LLMQueryResponse(
+        answer=answer,
+        question=request.question,
+        difficulty=request.difficulty,
+        language=request.language
+    )
+    
+    # Cache the response for future requests
+    await cache_response(request, llm_response, cache_key)
+    if question_vector is not None:
+        add_response(request, question_vector, llm_response)
+    
+    return llm_response
+
+
+async def generate_response(
+    request: LLMQueryRequest,
+    check_cache: bool = True,
+    cache_key: Optional[str] = None
+) -> LLMQueryResponse:
     """
     Generate a response using Gemini LLM based on the query request.
-    Checks cache first, then generates and caches the response if not found.
+    Checks cache first, then the semantic cache for paraphrased questions,
+    then generates and caches the response if not found. Concurrent misses
+    for the same cache key share one generation.
+    Pass check_cache=False when the caller has already looked the request up,
+    and cache_key to reuse the key it computed.
     """
     try:
-        # Check cache first
-        cached_response = await get_cached_response(request)
-        if cached_response:
-            logger.info("Returning cached LLM response")
-            return cached_response
-        
-        # Cache miss - generate new response
-        logger.info("Cache miss - generating new LLM response")
-        system_prompt = get_system_prompt(
-            request.difficulty,
-            request.language,
-            request.allow_code_mixing
-        )
-        
-        # Construct the full prompt
-        full_prompt = f"{system_prompt}\n\nQuestion: {request.question}\n\nAnswer:"
-        
-        # Generate response (run in thread pool to avoid blocking event loop)
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: model.generate_content(full_prompt)
-        )
-        
-        answer = response.text.strip()
+        if cache_key is None:
+            cache_key = generate_cache_key(request)
         
-        llm_response = LLMQueryResponse(
-            answer=answer,
-            question=request.question,
-            difficulty=request.difficulty,
-            language=request.language
-        )
+        # Check cache first
+        if check_cache:
+            cached_response = await get_cached_response(request, cache_key)
+            if cached_response:
+                logger.info("Returning cached LLM response")
+                return cached_response
         
-        # Cache the response for future requests
-        await cache_response(request, llm_response)
+        inflight = _inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(_generate_uncached(request, cache_key))
+            _inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+        else:
+            logger.info("Awaiting in-flight LLM generation for the same query")
         
-        return llm_response
+        # Shielded so one caller going away does not cancel the shared generation
+        return await asyncio.shield(inflight)
     
     except Exception as e:
         logger.error(f"Error generating Gemini response: {str(e)}")
         raise Exception(f"Failed to generate response: {str(e)}")
-
@@ -2,11 +2,18 @@
 Ollama LLM Service - Generates summaries explaining gene edit suggestions
 Uses llama3.2 model to provide human-readable explanations of edit effects
 """
+import hashlib
 import httpx
+import orjson
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from cachetools import TTLCache
+from typing import Dict, List, Any, Optional, Tuple
 from schemas.gene_analysis import GeneAnalysisResponse, EditSuggestion, SNPChange, EditSummary
+from core.redis import get_redis
+from core.circuit_breaker import CircuitBreaker
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +21,54 @@ logger = logging.getLogger(__name__)
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_MODEL = "llama3.2"
 
+# Sampling options sent with every summary request; num_predict caps the
+# output length (3-5 paragraphs fit well within it)
+_OLLAMA_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "num_predict": 1000
+}
+
+# While Ollama is down, summaries fall back immediately instead of waiting on connects
+ollama_breaker = CircuitBreaker(fail_max=3, reset_timeout=30.0)
+
+SUMMARY_CACHE_PREFIX = "ollama:summary:"
+
+# Generated summaries by prompt hash, checked before Redis
+_summary_responses: TTLCache = TTLCache(maxsize=1024, ttl=86400)
+
+# Ollama calls in progress by prompt hash; concurrent identical prompts await the first
+_inflight: Dict[str, asyncio.Task] = {}
+
 
 async def generate_edit_summary(
     analysis_result: GeneAnalysisResponse,
-    target_trait: str
-) -> str:
+    target_trait: str,
+    client: httpx.AsyncClient
+) -> Tuple[str, bool]:
     """
     Generate a comprehensive summary explaining the gene edit suggestions and their effects.
     
     Args:
         analysis_result: The complete gene analysis response with edit suggestions
         target_trait: The target trait being optimized (e.g., "plant_height")
+        client: Shared HTTP client with OLLAMA_BASE_URL as its base URL
     
     Returns:
-        A human-readable summary explaining the edit suggestions and their potential effects
+        A human-readable summary explaining the edit suggestions and their potential effects,
+        and whether it was generated by the model (False for the fallback summary)
     """
     try:
         # Build context from analysis results
         edit_suggestions_text = _format_edit_suggestions(analysis_result.edit_suggestions)
         snp_changes_text = _format_snp_changes(analysis_result.snp_changes)
         summary_metrics = analysis_result.summary
+        trait_title = target_trait.replace('_', ' ').title()
         
         # Create prompt for Ollama
         prompt = f"""You are an expert geneticist providing clear, constructive, and forward-looking insights about CRISPR gene editing results from an advanced agricultural biotechnology platform.
 
-A comprehensive gene editing analysis has been completed targeting {target_trait.replace('_', ' ').title()}. The platform generated multiple CRISPR-based edit suggestions highlighting its precision and analytical depth.
+A comprehensive gene editing analysis has been completed targeting {trait_title}. The platform generated multiple CRISPR-based edit suggestions highlighting its precision and analytical depth.
 
 Edit Suggestions:
 {edit_suggestions_text}
@@ -50,11 +80,11 @@ Please provide a detailed, scientifically grounded summary that maintains a posi
 
 1. Scientific Rigor and Precision
 
-Describe how the proposed edits reflect modern CRISPR methodologies and advanced genomic targeting. Explain how the platform’s output demonstrates precise, well-defined modification strategies for enhancing {target_trait.replace('_', ' ').title()}.
+Describe how the proposed edits reflect modern CRISPR methodologies and advanced genomic targeting. Explain how the platform’s output demonstrates precise, well-defined modification strategies for enhancing {trait_title}.
 
 2. Biological Interpretation
 
-Using established plant genetics knowledge, describe what these edits could mean biologically. Highlight the potential functional roles of the genes or regions involved and how these edits may contribute to a deeper understanding or potential improvement of {target_trait.replace('_', ' ').title()}.
+Using established plant genetics knowledge, describe what these edits could mean biologically. Highlight the potential functional roles of the genes or regions involved and how these edits may contribute to a deeper understanding or potential improvement of {trait_title}.
 
 3. Practical Research Value
 
@@ -80,46 +110,113 @@ Provide 3–5 polished, well-structured paragraphs summarizing the results.
 """
 
         # Call Ollama API
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json={
-                    "model": OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "max_tokens": 1000
-                    }
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            # Ollama API returns the response text in the "response" field when stream=false
-            summary = result.get("response", "").strip()
-            
-            # Fallback: if response field is empty, try to get from other possible fields
-            if not summary:
-                # Sometimes Ollama might return the text directly or in a different format
-                summary = result.get("text", "").strip() or str(result).strip()
-                
-            if not summary:
-                logger.warning("Empty response from Ollama, using fallback summary")
-                return _generate_fallback_summary(analysis_result, target_trait)
-            
-            return summary
+        summary = await _request_summary_once(client, prompt)
+        
+        if not summary:
+            logger.warning("Empty response from Ollama, using fallback summary")
+            return _generate_fallback_summary(analysis_result, target_trait), False
+        
+        return summary, True
             
     except httpx.TimeoutException:
         logger.error("Ollama API request timed out")
-        return _generate_fallback_summary(analysis_result, target_trait)
+        return _generate_fallback_summary(analysis_result, target_trait), False
     except httpx.HTTPStatusError as e:
         logger.error(f"Ollama API error: {e.response.status_code} - {e.response.text}")
-        return _generate_fallback_summary(analysis_result, target_trait)
+        return _generate_fallback_summary(analysis_result, target_trait), False
     except Exception as e:
         logger.error(f"Error generating Ollama summary: {str(e)}")
-        return _generate_fallback_summary(analysis_result, target_trait)
+        return _generate_fallback_summary(analysis_result, target_trait), False
+
+
+async def _request_summary(client: httpx.AsyncClient, prompt: str) -> str:
+    """
+    Call Ollama for a prompt and return the generated text (empty if none).
+    The reply is streamed, so the timeout bounds the wait for each chunk
+    rather than the whole generation.
+    """
+    parts = []
+    async with client.stream(
+        "POST",
+        "/api/generate",
+        content=orjson.dumps({
+            "model": OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": True,
+            "options": _OLLAMA_OPTIONS
+        }),
+        headers={"Content-Type": "application/json"}
+    ) as response:
+        if response.is_error:
+            await response.aread()
+        response.raise_for_status()
+        
+        # One JSON object per line; the text arrives in "response" fragments
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                break
+    
+    return "".join(parts).strip()
+
+
+async def _fetch_summary(client: httpx.AsyncClient, prompt: str, key: str) -> str:
+    """
+    Return the summary for a prompt from Redis, or generate it with Ollama and
+    cache it. Cache errors never fail the request.
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            cached = await redis.get(f"{SUMMARY_CACHE_PREFIX}{key}")
+            if cached:
+                logger.info(f"Summary cache hit for prompt {key}")
+                _summary_responses[key] = cached
+                return cached
+        except Exception as e:
+            logger.warning(f"Error retrieving summary from cache: {str(e)}")
+    
+    if not ollama_breaker.allow_request():
+        raise RuntimeError("Ollama unavailable (circuit open), skipping call")
+    try:
+        summary = await _request_summary(client, prompt)
+    except Exception:
+        ollama_breaker.record_failure()
+        raise
+    ollama_breaker.record_success()
+    if not summary:
+        return summary
+    
+    _summary_responses[key] = summary
+    if redis is not None:
+        try:
+            await redis.setex(f"{SUMMARY_CACHE_PREFIX}{key}", settings.REDIS_CACHE_TTL, summary)
+        except Exception as e:
+            logger.warning(f"Error caching summary: {str(e)}")
+    return summary
+
+
+async def _request_summary_once(client: httpx.AsyncClient, prompt: str) -> str:
+    """
+    Return the summary for a prompt, served from cache when the same prompt was
+    answered before and sharing one Ollama call among concurrent identical prompts
+    """
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    summary = _summary_responses.get(key)
+    if summary is not None:
+        return summary
+    
+    inflight = _inflight.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_fetch_summary(client, prompt, key))
+        _inflight[key] = inflight
+        inflight.add_done_callback(lambda _: _inflight.pop(key, None))
+    
+    # Shielded so one caller going away does not cancel the shared call
+    return await asyncio.shield(inflight)
 
 
 def _format_edit_suggestions(suggestions: List[EditSuggestion]) -> str:
@@ -128,15 +225,11 @@ def _format_edit_suggestions(suggestions: List[EditSuggestion]) -> str:
         return "No edit suggestions available."
     
     # Provide minimal context without specific metrics
-    formatted = []
-    for i, sug in enumerate(suggestions, 1):
-        edit_type = sug.edit_type
-        base_change = ""
-        if sug.original_base and sug.target_base:
-            base_change = f" ({sug.original_base} → {sug.target_base})"
-        
-        formatted.append(f"Edit {i}: {edit_type} modification{base_change}")
-    
+    formatted = (
+        f"Edit {i}: {sug.edit_type} modification"
+        + (f" ({sug.original_base} → {sug.target_base})" if sug.original_base and sug.target_base else "")
+        for i, sug in enumerate(suggestions, 1)
+    )
     return "Types of edits proposed: " + "; ".join(formatted)
 
 
@@ -145,13 +238,13 @@ def _format_snp_changes(snp_changes: List[SNPChange]) -> str:
     if not snp_changes:
         return "No SNP changes identified in the analysis."
     
-    # Count causal candidates for general context
-    causal_count = sum(1 for snp in snp_changes if snp.is_causal_candidate)
-    
-    # Get general regions/chromosomes affected
-    chromosomes_affected = set(snp.chromosome for snp in snp_changes)
+    # Count causal candidates and collect the chromosomes and genes affected in one pass
+    causal_count = 0
+    chromosomes_affected = set()
     nearby_genes = set()
     for snp in snp_changes:
+        causal_count += snp.is_causal_candidate
+        chromosomes_affected.add(snp.chromosome)
         nearby_genes.update(snp.nearby_genes)
     
     context_parts = []
@@ -161,7 +254,7 @@ def _format_snp_changes(snp_changes: List[SNPChange]) -> str:
         context_parts.append(f"Several of these are identified as potential causal variants for the target trait.")
     
     if nearby_genes:
-        gene_list = list(nearby_genes)[:5]  # Limit to 5 for brevity
+        gene_list = list(islice(nearby_genes, 5))  # Limit to 5 for brevity
         context_parts.append(f"The affected regions are near genes involved in: {', '.join(gene_list)}{' and others' if len(nearby_genes) > 5 else ''}.")
     
     return " ".join(context_parts)
@@ -0,0 +1,87 @@
+"""
+Semantic LLM response cache - reuses answers for paraphrased questions
+Questions are embedded with Gemini and compared by cosine similarity within
+the same (difficulty, language, allow_code_mixing) bucket.
+"""
+import asyncio
+import google.generativeai as genai
+from concurrent.futures import Executor
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from schemas.llm import LLMQueryRequest, LLMQueryResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+EMBEDDING_DIMENSIONS = 256
+SIMILARITY_THRESHOLD = 0.90
+MAX_ENTRIES_PER_BUCKET = 512
+
+BucketKey = Tuple[str, str, bool]
+
+# bucket -> (unit vectors, one row per entry; responses in the same order)
+_buckets: Dict[BucketKey, Tuple[np.ndarray, List[LLMQueryResponse]]] = {}
+
+
+def _bucket_key(request: LLMQueryRequest) -> BucketKey:
+    return (request.difficulty.value, request.language.value, request.allow_code_mixing)
+
+
+async def embed_question(question: str, executor: Optional[Executor] = None) -> Optional[np.ndarray]:
+    """
+    Embed a question as a unit vector, or None if the embedding call fails.
+    SDKs without embed_content_async run the blocking call on executor
+    (the loop's default if None).
+    """
+    try:
+        embed_args = dict(
+            model=EMBEDDING_MODEL,
+            content=question,
+            task_type="SEMANTIC_SIMILARITY",
+            output_dimensionality=EMBEDDING_DIMENSIONS
+        )
+        if hasattr(genai, "embed_content_async"):
+            result = await genai.embed_content_async(**embed_args)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, lambda: genai.embed_content(**embed_args))
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    except Exception as e:
+        logger.warning(f"Error embedding question for semantic cache: {str(e)}")
+        return None
+
+
+def find_similar_response(request: LLMQueryRequest, vector: np.ndarray) -> Optional[LLMQueryResponse]:
+    """
+    Return the cached response whose question is most similar to this one,
+    if it clears SIMILARITY_THRESHOLD.
+    """
+    bucket = _buckets.get(_bucket_key(request))
+    if bucket is None:
+        return None
+    vectors, responses = bucket
+    similarities = vectors @ vector
+    best = int(np.argmax(similarities))
+    if similarities[best] < SIMILARITY_THRESHOLD:
+        return None
+    logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+    return responses[best].model_copy(update={"question": request.question})
+
+
+def add_response(request: LLMQueryRequest, vector: np.ndarray, response: LLMQueryResponse) -> None:
+    """
+    Remember a generated response under its question embedding; the oldest
+    entry is dropped once the bucket is full.
+    """
+    key = _bucket_key(request)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        _buckets[key] = (vector[np.newaxis, :], [response])
+        return
+    vectors, responses = bucket
+    if len(responses) >= MAX_ENTRIES_PER_BUCKET:
+        vectors, responses = vectors[1:], responses[1:]
+    _buckets[key] = (np.vstack((vectors, vector)), responses + [response])
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+from bson import Binary
+from datetime import datetime, timedelta
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Characters kept inline on analysis documents for history listings
+SEQUENCE_PREVIEW_LENGTH = 101
+
+# Sequences are shared between analyses, so they are not expired directly.
+# A periodic sweep deletes those no analysis references any more; anything
+# stored or reused within the grace period is skipped, since its analysis
+# may not have been inserted yet.
+SEQUENCE_SWEEP_INTERVAL = 6 * 3600
+SEQUENCE_GRACE_PERIOD = timedelta(days=1)
+SEQUENCE_SWEEP_BATCH_SIZE = 1000
+
+# 2-bit codes for pure A/C/G/T sequences; anything else is stored as text
+_BASES = "ACGT"
+_BASE_SET = frozenset(_BASES)
+_ENCODE_TABLE = bytes.maketrans(_BASES.encode(), bytes(range(4)))
+_DECODE_TABLE = [
+    "".join(_BASES[(byte >> shift) & 3] for shift in (6, 4, 2, 0))
+    for byte in range(256)
+]
+
+
+def sequence_ref(sequence: str) -> str:
+    """Content hash identifying a DNA sequence in gene_sequences"""
+    return hashlib.sha1(sequence.encode()).hexdigest()
+
+
+def pack_sequence(sequence: str) -> Optional[bytes]:
+    """
+    Pack an A/C/G/T sequence at four bases per byte, or return None if it has
+    any other character
+    """
+    if not sequence or not _BASE_SET.issuperset(sequence):
+        return None
+    codes = sequence.encode("ascii").translate(_ENCODE_TABLE)
+    codes += bytes(-len(codes) % 4)
+    return bytes(
+        (codes[i] << 6) | (codes[i + 1] << 4) | (codes[i + 2] << 2) | codes[i + 3]
+        for i in range(0, len(codes), 4)
+    )
+
+
+def unpack_sequence(packed: bytes, length: int) -> str:
+    """Inverse of pack_sequence"""
+    return "".join([_DECODE_TABLE[byte] for byte in packed])[:length]
+
+
+async def store_sequence(db: AsyncIOMotorDatabase, sequence: str) -> str:
+    """
+    Store a DNA sequence once, keyed by its hash, and return the reference.
+    Analyses of the same sequence share one stored copy.
+    """
+    ref = sequence_ref(sequence)
+    packed = pack_sequence(sequence)
+    if packed is not None:
+        stored = {"packed": Binary(packed), "length": len(sequence)}
+    else:
+        stored = {"sequence": sequence}
+    now = datetime.utcnow()
+    stored["created_at"] = now
+    try:
+        # last_used_at protects a reused sequence from the orphan sweep
+        await db.gene_sequences.update_one(
+            {"_id": ref},
+            {"$setOnInsert": stored, "$set": {"last_used_at": now}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A concurrent upsert stored it first
+        pass
+    return ref
+
+
+async def load_sequence(db: AsyncIOMotorDatabase, analysis: dict) -> str:
+    """
+    Return the full DNA sequence for an analysis document, inline or by reference
+    """
+    if "dna_sequence" in analysis:
+        return analysis["dna_sequence"]
+    ref: Optional[str] = analysis.get("dna_sequence_ref")
+    if not ref:
+        return ""
+    stored = await db.gene_sequences.find_one({"_id": ref}, projection={"created_at": 0})
+    if stored is None:
+        logger.warning(f"Sequence {ref} referenced by analysis {analysis.get('_id')} not found")
+        return analysis.get("dna_sequence_preview", "")
+    if "packed" in stored:
+        return unpack_sequence(stored["packed"], stored["length"])
+    return stored["sequence"]
+
+
+def _unused_since(cutoff: datetime) -> dict:
+    """Filter for sequences not stored or reused since cutoff"""
+    return {"$or": [
+        {"last_used_at": {"$lt": cutoff}},
+        # Stored before last_used_at was tracked
+        {"last_used_at": {"$exists": False}, "created_at": {"$lt": cutoff}}
+    ]}
+
+
+async def _delete_unused(db: AsyncIOMotorDatabase, refs: list, cutoff: datetime) -> int:
+    # The filter is re-applied so a sequence reused since the scan is kept
+    result = await db.gene_sequences.delete_many({"_id": {"$in": refs}, **_unused_since(cutoff)})
+    return result.deleted_count
+
+
+async def purge_orphaned_sequences(db: AsyncIOMotorDatabase) -> int:
+    """
+    Delete stored sequences that no analysis references any more, e.g. after
+    their analyses expired or were deleted. Returns the number removed.
+    """
+    cutoff = datetime.utcnow() - SEQUENCE_GRACE_PERIOD
+    cursor = db.gene_sequences.aggregate([
+        {"$match": _unused_since(cutoff)},
+        {"$project": {"_id": 1}},
+        # Equality lookup so each probe uses the dna_sequence_ref index; the
+        # pipeline only stops at the first referencing analysis (MongoDB 5.0+)
+        {"$lookup": {
+            "from": "gene_analyses",
+            "localField": "_id",
+            "foreignField": "dna_sequence_ref",
+            "pipeline": [
+                {"$limit": 1},
+                {"$project": {"_id": 1}}
+            ],
+            "as": "analyses"
+        }},
+        {"$match": {"analyses": {"$size": 0}}},
+        {"$project": {"_id": 1}}
+    ])
+    
+    removed = 0
+    batch = []
+    async for doc in cursor:
+        batch.append(doc["_id"])
+        if len(batch) >= SEQUENCE_SWEEP_BATCH_SIZE:
+            removed += await _delete_unused(db, batch, cutoff)
+            batch = []
+    if batch:
+        removed += await _delete_unused(db, batch, cutoff)
+    
+    if removed:
+        logger.info(f"Purged {removed} orphaned sequences")
+    return removed
+
+
+async def _run_sweeper(db: AsyncIOMotorDatabase) -> None:
+    while True:
+        try:
+            await purge_orphaned_sequences(db)
+        except Exception as e:
+            logger.error(f"Error purging orphaned sequences: {e}")
+        await asyncio.sleep(SEQUENCE_SWEEP_INTERVAL)
+
+
+def start_sequence_sweeper(db: AsyncIOMotorDatabase) -> asyncio.Task:
+    """Start the background task that removes orphaned sequences"""
+    return asyncio.create_task(_run_sweeper(db))
+
+
+async def stop_sequence_sweeper(task: asyncio.Task) -> None:
+    """Stop the sweeper"""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
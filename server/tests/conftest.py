@@ -0,0 +1,7 @@
+import os
+
+# Settings are read at import time; tests never reach these services
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "agroterror_test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini-key")
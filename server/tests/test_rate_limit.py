@@ -0,0 +1,59 @@
+"""
+Tests for the Redis fixed-window rate limiter
+"""
+import asyncio
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+
+from core import rate_limit
+
+
+def _request(host: str = "203.0.113.7") -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "client": (host, 50000)})
+
+
+@pytest.fixture(autouse=True)
+def reset_limiter_state(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_script_sha", None)
+    monkeypatch.setattr(rate_limit, "_fire_windows", {})
+    monkeypatch.setattr(rate_limit, "_fire_queue", None)
+
+
+def _use_redis(monkeypatch) -> fakeredis.FakeAsyncRedis:
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: client)
+    return client
+
+
+def test_first_flush_with_several_hits_starts_the_window(monkeypatch):
+    async def scenario():
+        client = _use_redis(monkeypatch)
+        monkeypatch.setattr(rate_limit, "_fire_queue", asyncio.Queue())
+        request = _request()
+        rate_limit.hit_fire_and_forget(request, "auth_login")
+        rate_limit.hit_fire_and_forget(request, "auth_login")
+        assert await rate_limit._flush_batch([rate_limit._fire_queue.get_nowait()])
+        key = rate_limit.rate_limit_key(request, "auth_login")
+        return int(await client.get(key)), await client.pttl(key)
+
+    count, ttl = asyncio.run(scenario())
+    _, window_ms = rate_limit.get_rate_limit_parsed("auth_login")
+    assert count == 2
+    assert 0 < ttl <= window_ms
+
+
+def test_later_hits_do_not_extend_the_window(monkeypatch):
+    async def scenario():
+        client = _use_redis(monkeypatch)
+        request = _request()
+        key = rate_limit.rate_limit_key(request, "auth_me")
+        await rate_limit.rate_limited_pipeline(request, "auth_me")
+        await client.pexpire(key, 5_000)
+        await rate_limit.rate_limited_pipeline(request, "auth_me")
+        return int(await client.get(key)), await client.pttl(key)
+
+    count, ttl = asyncio.run(scenario())
+    assert count == 2
+    assert 0 < ttl <= 5_000